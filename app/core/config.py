@@ -51,19 +51,27 @@ class Settings(BaseSettings):
     # Celery
     CELERY_BROKER_URL: str = "redis://redis:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://redis:6379/0"
+    CELERY_WORKER_CONCURRENCY: int = 32  # pool threads per worker process
 
     # Pipeline Configuration
     PIPELINE_MAX_EXECUTION_TIME: int = 3600
     PIPELINE_STEP_TIMEOUT: int = 300
     PIPELINE_MAX_RETRIES: int = 3
+    PIPELINE_STEP_CACHE_TTL: int = 3600  # 0 disables the step output cache
+    PIPELINE_INLINE_STEPS: bool = False  # run steps in the orchestrator task
 
     # File Processing Configuration
     MAX_FILE_SIZE: int = 100 * 1024 * 1024
+    FILE_SPOOL_MAX_SIZE: int = 32 * 1024 * 1024  # larger files spill to disk
     SUPPORTED_FILE_TYPES: list = ["pdf", "docx", "txt", "csv", "json", "xml"]
 
     # Custom Python Code Configuration
     CUSTOM_PYTHON_TIMEOUT: int = 120
     CUSTOM_PYTHON_MAX_MEMORY: str = "512M"
+    # Run custom code inside the worker process, with its credentials and
+    # globals, instead of a subprocess. Only for deployments whose pipeline
+    # authors are all trusted.
+    CUSTOM_PYTHON_IN_PROCESS: bool = False
 
     # OpenAI settings
     OPENAI_API_KEY: Optional[str] = None
@@ -0,0 +1,34 @@
+import logging
+from typing import Optional
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis_client: Optional[redis.Redis] = None
+
+
+async def get_redis() -> redis.Redis:
+    """
+    Get or create a Redis client instance.
+
+    Returns:
+        Redis client instance
+    """
+    global _redis_client
+
+    if _redis_client is None:
+        try:
+            _redis_client = redis.Redis(
+                host=settings.REDIS_HOST, port=settings.REDIS_PORT
+            )
+            logger.info(
+                f"Connected to Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to connect to Redis: {e}")
+            raise
+
+    return _redis_client
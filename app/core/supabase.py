@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from typing import Optional
@@ -10,6 +11,7 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 _supabase_client: Optional[Client] = None
+_supabase_client_lock = asyncio.Lock()
 
 
 async def get_supabase() -> Client:
@@ -22,14 +24,17 @@ async def get_supabase() -> Client:
     global _supabase_client
 
     if _supabase_client is None:
-        try:
-            _supabase_client = await create_client(
-                settings.SUPABASE_URL, settings.SUPABASE_KEY
-            )
-            logger.info(f"Connected to Supabase at {settings.SUPABASE_URL}")
-        except Exception as e:
-            logger.error(f"Failed to connect to Supabase: {e}")
-            raise
+        # Concurrent first callers wait for a single client to be created
+        async with _supabase_client_lock:
+            if _supabase_client is None:
+                try:
+                    _supabase_client = await create_client(
+                        settings.SUPABASE_URL, settings.SUPABASE_KEY
+                    )
+                    logger.info(f"Connected to Supabase at {settings.SUPABASE_URL}")
+                except Exception as e:
+                    logger.error(f"Failed to connect to Supabase: {e}")
+                    raise
 
     return _supabase_client
 
@@ -499,8 +499,10 @@ class FIBOService:
                 )
             finally:
                 # Clean up temp file
-                if os.path.exists(temp_file_path):
+                try:
                     os.unlink(temp_file_path)
+                except FileNotFoundError:
+                    pass
 
             return import_result
         except HTTPException:
@@ -538,8 +540,10 @@ class FIBOService:
                 )
             finally:
                 # Clean up temp file
-                if os.path.exists(temp_file_path):
+                try:
                     os.unlink(temp_file_path)
+                except FileNotFoundError:
+                    pass
 
             return import_result
         except HTTPException:
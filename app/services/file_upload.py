@@ -1,5 +1,7 @@
 import uuid
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict
+
+import httpx
 
 from fastapi import HTTPException, UploadFile, status
 from gotrue import Optional
@@ -299,6 +301,54 @@ class UploadService:
                 detail=f"Error retrieving file content: {str(e)}",
             )
 
+    async def get_file_content_stream(
+        self,
+        file_upload_id: str,
+        chunk_size: int = 1 << 20,
+        file_upload: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the content of a file from storage in chunks. Callers that
+        already loaded the file upload can pass it to skip looking it up.
+        """
+        try:
+            supabase = await get_supabase()
+            # Get the file upload to get storage path
+            if file_upload is None:
+                file_upload = await self.get_file_upload(file_upload_id)
+            storage_path = file_upload.get("storage_path")
+
+            if not storage_path:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="File storage path not found",
+                )
+
+            # Download through a short-lived signed URL so the body can be
+            # read incrementally instead of as one bytes object
+            try:
+                signed = await supabase.storage.from_(
+                    settings.S3_BUCKET_NAME
+                ).create_signed_url(storage_path, 60)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"File not found in storage: {str(e)}",
+                )
+
+            async with httpx.AsyncClient() as client:
+                async with client.stream("GET", signed["signedURL"]) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        yield chunk
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error streaming file content: {str(e)}",
+            )
+
     async def update_file_metadata(
         self,
         file_upload_id: str,
@@ -314,7 +314,7 @@ class PipelineService:
         try:
             supabase = await get_supabase()
             # Check if run exists
-            await self.get_pipeline_run(run_id, pipeline_id)
+            run = await self.get_pipeline_run(run_id, pipeline_id)
 
             # Update run
             data = run_update.model_dump(exclude_unset=True)
@@ -326,7 +326,6 @@ class PipelineService:
                 and run_update.end_time
                 and not run_update.duration
             ):
-                run = await self.get_pipeline_run(run_id, pipeline_id)
                 start_time = datetime.fromisoformat(str(run["start_time"]))
                 end_time = datetime.fromisoformat(str(run_update.end_time))
                 data["duration"] = int((end_time - start_time).total_seconds())
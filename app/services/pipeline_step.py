@@ -1,11 +1,11 @@
-import json
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence
 
 from fastapi import HTTPException, status
 from postgrest.base_request_builder import APIResponse
 
 from app.core.supabase import get_supabase
-from app.schemas.pipeline_step import PipelineStepCreate
+from app.schemas.pipeline_step import PipelineRunStatus, PipelineStepCreate
+from app.utils import serialization
 
 
 class PipelineStepService:
@@ -54,7 +54,10 @@ class PipelineStepService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Pipeline step not found",
                 )
-            return response.data
+            step = response.data
+            if isinstance(step.get("config"), str):
+                step["config"] = serialization.loads(step["config"])
+            return step
         except HTTPException:
             raise
         except Exception as e:
@@ -133,7 +136,7 @@ class PipelineStepService:
                 {
                     "name": data["name"],
                     "step_type": data["step_type"],
-                    "config": json.loads(data["config"]),
+                    "config": serialization.loads(data["config"]),
                     "run_order": data["run_order"],
                     # split string into list
                     "inputs": [
@@ -207,6 +210,78 @@ class PipelineStepService:
                 detail=f"Error retrieving pipeline step run: {str(e)}",
             )
 
+    async def get_completed_step_runs(
+        self,
+        pipeline_run_id: str,
+        step_ids: Sequence[str],
+        output_keys: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the latest completed run of each of the given steps in a pipeline
+        run, in a single query. With output_keys, only those keys of
+        output_data are selected.
+        """
+        columns = "*"
+        if output_keys:
+            columns = ",".join(
+                ["id", "step_id", "status"]
+                + [f"{key}:output_data->{key}" for key in output_keys]
+            )
+
+        try:
+            supabase = await get_supabase()
+            response = (
+                await supabase.from_("pipeline_step_runs")
+                .select(columns)
+                .eq("pipeline_run_id", pipeline_run_id)
+                .in_("step_id", list(step_ids))
+                .eq("status", PipelineRunStatus.COMPLETED.value)
+                .order("created_at", desc=True)
+                .execute()
+            )
+
+            step_runs = {}
+            for step_run in response.data:
+                # Rows are newest first; keep the latest run of each step
+                if step_run["step_id"] in step_runs:
+                    continue
+                if output_keys:
+                    output_data = {}
+                    for key in output_keys:
+                        value = step_run.pop(key, None)
+                        if value is not None:
+                            output_data[key] = value
+                    step_run["output_data"] = output_data
+                step_runs[step_run["step_id"]] = step_run
+            return step_runs
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error retrieving pipeline step runs: {str(e)}",
+            )
+
+    async def get_failed_step_run(
+        self, pipeline_run_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get the latest failed step run of a pipeline run, if any"""
+        try:
+            supabase = await get_supabase()
+            response = (
+                await supabase.from_("pipeline_step_runs")
+                .select("id,step_id,error_message")
+                .eq("pipeline_run_id", pipeline_run_id)
+                .eq("status", PipelineRunStatus.FAILED.value)
+                .order("end_time", desc=True)
+                .limit(1)
+                .execute()
+            )
+            return response.data[0] if response.data else None
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error retrieving failed pipeline step run: {str(e)}",
+            )
+
     async def create_step_run(self, step_run_in: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new pipeline step run"""
         try:
@@ -226,6 +301,46 @@ class PipelineStepService:
                 detail=f"Error creating pipeline step run: {str(e)}",
             )
 
+    async def bulk_create_step_runs(
+        self, step_runs_in: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Create several pipeline step runs with a single insert"""
+        try:
+            supabase = await get_supabase()
+            response = (
+                await supabase.from_("pipeline_step_runs")
+                .insert(step_runs_in)
+                .execute()
+            )
+            if len(response.data) != len(step_runs_in):
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to create pipeline step runs",
+                )
+            return response.data
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error creating pipeline step runs: {str(e)}",
+            )
+
+    async def cancel_pending_step_runs(self, pipeline_run_id: str) -> None:
+        """Mark the step runs of a pipeline run that never started as cancelled"""
+        try:
+            supabase = await get_supabase()
+            await (
+                supabase.from_("pipeline_step_runs")
+                .update({"status": PipelineRunStatus.CANCELLED.value})
+                .eq("pipeline_run_id", pipeline_run_id)
+                .eq("status", PipelineRunStatus.PENDING.value)
+                .execute()
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error cancelling pending pipeline step runs: {str(e)}",
+            )
+
     async def update_pipeline_step_run(
         self, step_run_id: str, pipeline_run_id: str, step_run_in: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -63,81 +63,84 @@ async def process_file(file_id: UUID) -> bool:
             ).eq("id", str(file_id)).execute()
             return False
 
-        # Determine file type and parse content
-        file_type = get_file_type(file_info["file_name"], file_info["file_type"])
-        text_content = await parse_file_content(local_path, file_type)
+        try:
+            # Determine file type and parse content
+            file_type = get_file_type(file_info["file_name"], file_info["file_type"])
+            text_content = await parse_file_content(local_path, file_type)
+
+            if not text_content:
+                logger.error(f"Failed to parse file content: {local_path}")
+                await supabase.table("file_uploads").update(
+                    {
+                        "upload_status": "failed",
+                        "metadata": {
+                            **(file_info.get("metadata") or {}),
+                            "error": "Failed to parse file content",
+                        },
+                    }
+                ).eq("id", str(file_id)).execute()
+                return False
+
+            # Process the text in chunks
+            chunks = chunk_text(text_content)
+
+            total_entities = 0
+            total_relationships = 0
+
+            for i, chunk in enumerate(chunks):
+                # Extract entities
+                entities = await extract_entities(chunk)
+
+                # Log progress
+                logger.info(
+                    f"Extracted {len(entities)} entities from chunk {i+1}/{len(chunks)}"
+                )
+
+                # Extract relationships
+                relationships = await extract_relationships(chunk, entities)
+
+                # Log progress
+                logger.info(
+                    f"Extracted {len(relationships)} relationships from chunk {i+1}/{len(chunks)}"
+                )
 
-        if not text_content:
-            logger.error(f"Failed to parse file content: {local_path}")
+                # Save extraction results
+                await save_extraction_results(
+                    file_id=file_id,
+                    chunk_index=i,
+                    text_length=len(chunk),
+                    entities=entities,
+                    relationships=relationships,
+                )
+
+                total_entities += len(entities)
+                total_relationships += len(relationships)
+
+            # Update file status to completed
             await supabase.table("file_uploads").update(
                 {
-                    "upload_status": "failed",
+                    "upload_status": "completed",
+                    "processed": True,
                     "metadata": {
                         **(file_info.get("metadata") or {}),
-                        "error": "Failed to parse file content",
+                        "total_entities": total_entities,
+                        "total_relationships": total_relationships,
+                        "chunks_processed": len(chunks),
+                        "processed_at": datetime.now().isoformat(),
                     },
                 }
             ).eq("id", str(file_id)).execute()
-            return False
 
-        # Process the text in chunks
-        chunks = chunk_text(text_content)
-
-        total_entities = 0
-        total_relationships = 0
-
-        for i, chunk in enumerate(chunks):
-            # Extract entities
-            entities = await extract_entities(chunk)
-
-            # Log progress
             logger.info(
-                f"Extracted {len(entities)} entities from chunk {i+1}/{len(chunks)}"
+                f"Successfully processed file {file_id}: {total_entities} entities, {total_relationships} relationships"
             )
-
-            # Extract relationships
-            relationships = await extract_relationships(chunk, entities)
-
-            # Log progress
-            logger.info(
-                f"Extracted {len(relationships)} relationships from chunk {i+1}/{len(chunks)}"
-            )
-
-            # Save extraction results
-            await save_extraction_results(
-                file_id=file_id,
-                chunk_index=i,
-                text_length=len(chunk),
-                entities=entities,
-                relationships=relationships,
-            )
-
-            total_entities += len(entities)
-            total_relationships += len(relationships)
-
-        # Update file status to completed
-        await supabase.table("file_uploads").update(
-            {
-                "upload_status": "completed",
-                "processed": True,
-                "metadata": {
-                    **(file_info.get("metadata") or {}),
-                    "total_entities": total_entities,
-                    "total_relationships": total_relationships,
-                    "chunks_processed": len(chunks),
-                    "processed_at": datetime.now().isoformat(),
-                },
-            }
-        ).eq("id", str(file_id)).execute()
-
-        # Clean up local file
-        if os.path.exists(local_path):
-            os.remove(local_path)
-
-        logger.info(
-            f"Successfully processed file {file_id}: {total_entities} entities, {total_relationships} relationships"
-        )
-        return True
+            return True
+        finally:
+            # Clean up local file
+            try:
+                os.remove(local_path)
+            except FileNotFoundError:
+                pass
 
     except Exception as e:
         logger.error(f"Error processing file {file_id}: {str(e)}")
@@ -4,6 +4,7 @@ from uuid import UUID
 import os
 import json
 from datetime import datetime
+from pathlib import Path
 import asyncio
 
 from app.core.supabase import get_supabase
@@ -198,8 +199,7 @@ async def ingest_api_data(
 
             os.makedirs(os.path.dirname(temp_path), exist_ok=True)
 
-            with open(temp_path, "wb") as f:
-                f.write(response.content)
+            await asyncio.to_thread(Path(temp_path).write_bytes, response.content)
 
             # Ingest the file
             return await ingest_file(
@@ -227,7 +227,7 @@ async def ingest_database_data(
     query: str,
     datasource_id: UUID,
     user_id: Optional[UUID] = None,
-    output_format: str = "csv",
+    output_format: str = "parquet",
     process_immediately: bool = True,
 ) -> Optional[Dict[str, Any]]:
     """
@@ -238,16 +238,16 @@ async def ingest_database_data(
         query: SQL query to execute
         datasource_id: ID of the data source
         user_id: ID of the user initiating the ingestion
-        output_format: Format to save the data (csv, json)
+        output_format: Format to save the data (parquet, csv, json)
         process_immediately: Whether to process the data immediately
 
     Returns:
         Data record or None if ingestion failed
     """
     try:
-        import sqlalchemy
         import pandas as pd
-        from sqlalchemy import create_engine, text
+        from sqlalchemy import create_engine, make_url, text
+        from sqlalchemy.ext.asyncio import create_async_engine
 
         supabase = await get_supabase()
 
@@ -263,45 +263,64 @@ async def ingest_database_data(
             logger.error(f"Data source {datasource_id} not found")
             return None
 
-        # Create engine
-        engine = create_engine(connection_string)
-
-        # Execute query
-        with engine.connect() as connection:
-            result = connection.execute(text(query))
-
-            # Convert to DataFrame
-            df = pd.DataFrame(result.fetchall(), columns=result.keys())
-
-            # Save to file
-            now = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-            file_name = f"db_export_{now}.{output_format}"
-            temp_path = os.path.join(os.getcwd(), "temp", file_name)
-
-            os.makedirs(os.path.dirname(temp_path), exist_ok=True)
-
-            if output_format == "csv":
-                df.to_csv(temp_path, index=False)
-                content_type = "text/csv"
-            else:
-                df.to_json(temp_path, orient="records")
-                content_type = "application/json"
-
-            # Ingest the file
-            return await ingest_file(
-                file_path=temp_path,
-                file_name=file_name,
-                content_type=content_type,
-                datasource_id=datasource_id,
-                user_id=user_id,
-                metadata={
-                    "row_count": len(df),
-                    "column_count": len(df.columns),
-                    "columns": df.columns.tolist(),
-                    "query": query,
-                },
-                process_immediately=process_immediately,
-            )
+        def fetch_rows():
+            engine = create_engine(connection_string)
+            try:
+                with engine.connect() as connection:
+                    result = connection.execute(text(query))
+                    return list(result.keys()), result.fetchall()
+            finally:
+                engine.dispose()
+
+        # Execute query. Async drivers run on the event loop; blocking ones
+        # in a thread so that they do not stall it.
+        if make_url(connection_string).get_dialect().is_async:
+            engine = create_async_engine(connection_string)
+            try:
+                async with engine.connect() as connection:
+                    result = await connection.execute(text(query))
+                    columns, rows = list(result.keys()), result.fetchall()
+            finally:
+                await engine.dispose()
+        else:
+            columns, rows = await asyncio.to_thread(fetch_rows)
+
+        # Convert to DataFrame
+        df = pd.DataFrame(rows, columns=columns)
+
+        # Save to file
+        now = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        file_name = f"db_export_{now}.{output_format}"
+        temp_path = os.path.join(os.getcwd(), "temp", file_name)
+
+        os.makedirs(os.path.dirname(temp_path), exist_ok=True)
+
+        if output_format == "parquet":
+            # Columnar and compressed: typed values are not serialized as text
+            await asyncio.to_thread(df.to_parquet, temp_path, index=False)
+            content_type = "application/vnd.apache.parquet"
+        elif output_format == "csv":
+            df.to_csv(temp_path, index=False)
+            content_type = "text/csv"
+        else:
+            df.to_json(temp_path, orient="records")
+            content_type = "application/json"
+
+        # Ingest the file
+        return await ingest_file(
+            file_path=temp_path,
+            file_name=file_name,
+            content_type=content_type,
+            datasource_id=datasource_id,
+            user_id=user_id,
+            metadata={
+                "row_count": len(df),
+                "column_count": len(df.columns),
+                "columns": df.columns.tolist(),
+                "query": query,
+            },
+            process_immediately=process_immediately,
+        )
 
     except Exception as e:
         logger.error(f"Error ingesting database data with query {query}: {str(e)}")
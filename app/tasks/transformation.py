@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Any, Dict, List
 from uuid import UUID
@@ -116,7 +117,7 @@ async def enrich_entities_with_embeddings(
         }
 
 async def sync_entities_to_neo4j(
-    entity_ids: List[UUID] | None = None,
+    entity_ids: List[str] | None = None,
     batch_size: int = 100
 ) -> Dict[str, Any]:
     """
@@ -141,7 +142,7 @@ async def sync_entities_to_neo4j(
             query = supabase.table("kg_entities").select("*")
             
             for i in range(0, len(entity_ids), 50):  # Process in chunks to avoid URI too long
-                batch_ids = [str(id) for id in entity_ids[i:i+50]]
+                batch_ids = entity_ids[i:i+50]
                 response = query.in_("id", batch_ids).execute()
         else:
             # Process all entities without Neo4j ID
@@ -223,7 +224,7 @@ async def sync_entities_to_neo4j(
         }
 
 async def sync_relationships_to_neo4j(
-    relationship_ids: List[UUID] | None = None,
+    relationship_ids: List[str] | None = None,
     batch_size: int = 100
 ) -> Dict[str, Any]:
     """
@@ -248,7 +249,7 @@ async def sync_relationships_to_neo4j(
             query = supabase.table("kg_relationships").select("*")
             
             for i in range(0, len(relationship_ids), 50):  # Process in chunks to avoid URI too long
-                batch_ids = [str(id) for id in relationship_ids[i:i+50]]
+                batch_ids = relationship_ids[i:i+50]
                 response = await query.in_("id", batch_ids).execute()
         else:
             # Process all relationships without Neo4j ID
@@ -277,8 +278,10 @@ async def sync_relationships_to_neo4j(
                 for relationship in batch:
                     try:
                         # Get Neo4j IDs of source and target entities
-                        source_response = await supabase.table("kg_entities").select("neo4j_id").eq("id", relationship["source_entity_id"]).execute()
-                        target_response = await supabase.table("kg_entities").select("neo4j_id").eq("id", relationship["target_entity_id"]).execute()
+                        source_response, target_response = await asyncio.gather(
+                            supabase.table("kg_entities").select("neo4j_id").eq("id", relationship["source_entity_id"]).execute(),
+                            supabase.table("kg_entities").select("neo4j_id").eq("id", relationship["target_entity_id"]).execute(),
+                        )
                         
                         if not source_response.data or not target_response.data:
                             logger.warning(f"Source or target entity not found for relationship {relationship['id']}")
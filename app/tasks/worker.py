@@ -1,22 +1,120 @@
 import asyncio
+import hashlib
 import json
-import os
 import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
 from datetime import datetime, timezone
-from functools import wraps
-from typing import Any, Dict, List, Optional, Tuple
+from difflib import SequenceMatcher
+from functools import lru_cache, wraps
+from types import CodeType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 from uuid import UUID, uuid4
 
-from celery import Celery
-from celery.signals import worker_process_init
+from celery import Celery, Task, chain, group
+from celery.signals import (
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 from celery.utils.log import get_task_logger
+from kombu import compression
+from kombu.serialization import register
+from openai import AsyncOpenAI
 from six import u
 
 from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.supabase import get_supabase
 from app.schemas.pipeline import PipelineRunStatus, PipelineRunUpdate
 from app.schemas.pipeline_step import PipelineRunStatus as StepStatus
 from app.schemas.pipeline_step import PipelineStepType
+from app.services.datasource import DataSourceService
 from app.services.fibo import FIBOService
+from app.services.file_upload import UploadService
+from app.services.pipeline import PipelineService
+from app.services.pipeline_step import PipelineStepService
+from app.tasks import extraction
+from app.tasks.ingestion import ingest_api_data, ingest_database_data
+from app.utils import serialization
+from app.utils.file_handler import process_file
+from app.utils.neo4j import get_neo4j_driver
+from app.utils.status_writer import get_status_writer
+
+# app.tasks.transformation stays imported inside the few tasks using it: it
+# loads sentence-transformers, and with it torch, into every worker process
+
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    from datasketch import MinHash, MinHashLSH
+    DATASKETCH_AVAILABLE = True
+except ImportError:
+    DATASKETCH_AVAILABLE = False
+
+try:
+    from rapidfuzz import fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    import asyncpg  # noqa: F401
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+
+# Prefer orjson for task and result payloads when it is installed
+if serialization.ORJSON_AVAILABLE:
+    register(
+        "orjson",
+        serialization.dumps,
+        serialization.loads,
+        content_type="application/x-orjson",
+        content_encoding="utf-8",
+    )
+    TASK_SERIALIZER = "orjson"
+    ACCEPT_CONTENT = ["orjson", "json"]
+else:
+    TASK_SERIALIZER = "json"
+    ACCEPT_CONTENT = ["json"]
+
+# Compress task and result payloads, which can carry large step outputs
+if ZSTD_AVAILABLE:
+    compression.register(
+        zstd.compress,
+        zstd.decompress,
+        "application/zstd",
+        aliases=["zstd"],
+    )
+    PAYLOAD_COMPRESSION = "zstd"
+else:
+    PAYLOAD_COMPRESSION = "gzip"
 
 # Create Celery app
 celery_app = Celery(
@@ -27,14 +125,32 @@ celery_app = Celery(
 
 # Configure Celery
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer=TASK_SERIALIZER,
+    accept_content=ACCEPT_CONTENT,
+    result_serializer=TASK_SERIALIZER,
+    task_compression=PAYLOAD_COMPRESSION,
+    result_compression=PAYLOAD_COMPRESSION,
+    redis_retry_on_timeout=True,
+    # Step results only need to live until their chord callback has joined
+    # them; chord parts are appended to a plain list rather than a sorted set
+    result_expires=settings.PIPELINE_MAX_EXECUTION_TIME,
+    result_backend_transport_options={"result_chord_ordered": False},
+    broker_transport_options={
+        "visibility_timeout": settings.PIPELINE_MAX_EXECUTION_TIME
+    },
     timezone="UTC",
     enable_utc=True,
-    worker_concurrency=4,
+    # Tasks only wait on the shared event loop while their I/O runs, so a
+    # thread pool can hold many more of them than there are cores
+    worker_pool="threads",
+    worker_concurrency=settings.CELERY_WORKER_CONCURRENCY,
+    # Reserve one task per pool thread so a slow step does not hold back
+    # queued steps that another worker could start
+    worker_prefetch_multiplier=1,
     task_acks_late=True,
     task_reject_on_worker_lost=True,
+    # Only enforced by the prefork steps_cpu worker; on the thread pool,
+    # async_task cancels tasks once they reach task_time_limit
     task_time_limit=3600,  # 1 hour
     task_soft_time_limit=3000,  # 50 minutes
     # FIXED ROUTING - Use the actual task names from @celery_app.task(name="...")
@@ -44,6 +160,8 @@ celery_app.conf.update(
         "run_pipeline_step": {"queue": "steps"},
         # Pipeline management tasks
         "cancel_pipeline_run": {"queue": "pipeline"},
+        "fail_pipeline_run": {"queue": "pipeline"},
+        "complete_pipeline": {"queue": "pipeline"},
         # Data processing tasks
         "process_file": {"queue": "steps"},
         "sync_to_neo4j": {"queue": "steps"},
@@ -60,32 +178,178 @@ celery_app.conf.update(
 # Initialize logger
 logger = get_task_logger(__name__)
 
-# Create an event loop for asyncio
+
+def utcnow_iso() -> str:
+    """Current UTC time as an ISO 8601 string, as stored in timestamptz columns"""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+# Persistent event loop shared by all tasks of a worker process. It runs
+# forever in a background thread so that tasks executed concurrently by the
+# thread pool interleave their awaits instead of queueing on
+# ``run_until_complete``.
 loop = None
+loop_thread = None
+_loop_lock = threading.Lock()
+
+# Celery's ``task.request`` is thread-local and therefore not visible from the
+# loop thread; bound tasks read their id from this context variable instead.
+current_task_id: ContextVar[Optional[str]] = ContextVar(
+    "current_task_id", default=None
+)
+
+
+def start_event_loop() -> asyncio.AbstractEventLoop:
+    """Start the worker event loop thread if it is not running yet."""
+    global loop, loop_thread
+
+    with _loop_lock:
+        if loop is None:
+            loop = (
+                uvloop.new_event_loop()
+                if UVLOOP_AVAILABLE
+                else asyncio.new_event_loop()
+            )
+            # Run new tasks eagerly up to their first suspension; lookups
+            # served from local caches then finish without a loop round-trip.
+            # uvloop passes its own eager_start argument to task factories,
+            # which asyncio's factory rejects, so it keeps its default one.
+            if not UVLOOP_AVAILABLE and hasattr(asyncio, "eager_task_factory"):
+                loop.set_task_factory(asyncio.eager_task_factory)
+            loop_thread = threading.Thread(
+                target=loop.run_forever, name="worker-event-loop", daemon=True
+            )
+            loop_thread.start()
+
+    return loop
+
+
+# Services shared by all tasks of a worker process
+_pipeline_service = None
+_step_service = None
+_upload_service = None
+_datasource_service = None
+
+
+def get_pipeline_service():
+    """Get the worker's PipelineService instance"""
+    global _pipeline_service
+
+    if _pipeline_service is None:
+        _pipeline_service = PipelineService()
+
+    return _pipeline_service
+
+
+def get_step_service():
+    """Get the worker's PipelineStepService instance"""
+    global _step_service
+
+    if _step_service is None:
+        _step_service = PipelineStepService()
+
+    return _step_service
+
+
+def get_upload_service():
+    """Get the worker's UploadService instance"""
+    global _upload_service
+
+    if _upload_service is None:
+        _upload_service = UploadService()
+
+    return _upload_service
+
+
+def get_datasource_service():
+    """Get the worker's DataSourceService instance"""
+    global _datasource_service
+
+    if _datasource_service is None:
+        _datasource_service = DataSourceService()
+
+    return _datasource_service
 
 
 @worker_process_init.connect
 def setup_worker_process(*args, **kwargs):
     """Initialize the worker process."""
-    global loop
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    start_event_loop()
+    get_pipeline_service()
+    get_step_service()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_pending_status_updates(*args, **kwargs):
+    """Write status updates still queued when the worker stops."""
+    if loop is None:
+        return
+
+    try:
+        asyncio.run_coroutine_threadsafe(get_status_writer().flush(), loop).result(
+            timeout=10
+        )
+    except Exception as e:
+        logger.error(f"Failed to flush status updates on shutdown: {e}")
 
 
 def async_task(func):
-    """Decorator to run async tasks in Celery."""
+    """
+    Decorator to run async tasks in Celery. The thread pool does not enforce
+    Celery's time limits, so tasks are cancelled once they have run for
+    task_time_limit seconds.
+    """
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        global loop
-        if loop is None:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        return loop.run_until_complete(func(*args, **kwargs))
+        event_loop = loop or start_event_loop()
+        if args and isinstance(args[0], Task):
+            # Captured into the context copied by run_coroutine_threadsafe
+            current_task_id.set(args[0].request.id)
+        future = asyncio.run_coroutine_threadsafe(
+            asyncio.wait_for(
+                func(*args, **kwargs), timeout=celery_app.conf.task_time_limit
+            ),
+            event_loop,
+        )
+        return future.result()
 
     return wrapper
 
 
+async def update_pipeline_run_status(
+    run_id: str, pipeline_id: str, run_update: PipelineRunUpdate
+) -> None:
+    """
+    Update a pipeline run. Intermediate updates are queued on the status
+    writer and merged with other pending ones. Final statuses flush the queue
+    first and go through PipelineService, which fills in the run duration.
+
+    Args:
+        run_id: Pipeline run ID
+        pipeline_id: Pipeline ID
+        run_update: Fields to update
+    """
+    status_writer = get_status_writer()
+
+    if run_update.status in (
+        PipelineRunStatus.COMPLETED,
+        PipelineRunStatus.FAILED,
+        PipelineRunStatus.CANCELLED,
+    ):
+        await status_writer.flush()
+        await get_pipeline_service().update_pipeline_run(
+            run_id, pipeline_id=pipeline_id, run_update=run_update
+        )
+    else:
+        await status_writer.put(
+            "pipeline_runs",
+            run_id,
+            run_update.model_dump(mode="json", exclude_unset=True),
+        )
+
+
 @celery_app.task(name="run_pipeline", bind=True)
 @async_task
 async def run_pipeline_task(
@@ -102,25 +366,19 @@ async def run_pipeline_task(
         run_id: ID of the pipeline run record (if already created)
         user_id: ID of the user triggering the pipeline
     """
-    from celery import chord, group
-
-    from app.services.pipeline import PipelineService
-    from app.services.pipeline_step import PipelineStepService
-
-    pipeline_service = PipelineService()
-    step_service = PipelineStepService()
+    step_service = get_step_service()
 
     try:
         logger.info(f"Starting pipeline {pipeline_id} execution")
 
         # Update pipeline run status to running
         if run_id:
-            await pipeline_service.update_pipeline_run(
+            await update_pipeline_run_status(
                 run_id,
                 pipeline_id=pipeline_id,
                 run_update=PipelineRunUpdate(
                     status=PipelineRunStatus.RUNNING,
-                    celery_task_id=self.request.id,
+                    celery_task_id=current_task_id.get(),
                 ),
             )
 
@@ -131,19 +389,46 @@ async def run_pipeline_task(
         if not steps:
             raise Exception("No steps found for pipeline")
 
+        # Only outputs that other steps consume are shared through Redis
+        consumed_step_ids = {dep for step in steps for dep in parse_step_inputs(step)}
+        for step in steps:
+            step["has_dependents"] = step["id"] in consumed_step_ids
+
         # Sort steps by run_order and organize by dependency levels
         dependency_levels = organize_steps_by_dependency_levels(steps)
 
+        # Create the runs of all steps up front with a single insert; each
+        # step then only has to update its own
+        step_runs = await step_service.bulk_create_step_runs(
+            [
+                {
+                    "pipeline_run_id": run_id,
+                    "step_id": step["id"],
+                    "status": StepStatus.PENDING,
+                    "run_order": step["run_order"],
+                }
+                for step in steps
+            ]
+        )
+        step_run_ids = {step_run["step_id"]: step_run["id"] for step_run in step_runs}
+        for step in steps:
+            step["step_run_id"] = step_run_ids[step["id"]]
+
+        # Small pipelines can skip the broker round-trip of a task per step
+        if settings.PIPELINE_INLINE_STEPS:
+            return await run_pipeline_inline(dependency_levels, pipeline_id, run_id)
+
         # Create task chains for each dependency level (simplified - no data passing)
         pipeline_workflow = create_pipeline_workflow(
             dependency_levels, pipeline_id, run_id
         )
 
-        # Execute the workflow
-        result = pipeline_workflow.apply_async()
+        # Publish the workflow from a worker thread: apply_async does blocking
+        # broker I/O and would stall every coroutine sharing the event loop
+        result = await asyncio.to_thread(pipeline_workflow.apply_async)
 
         # Store the workflow result ID for tracking
-        await pipeline_service.update_pipeline_run(
+        await update_pipeline_run_status(
             run_id,
             pipeline_id=pipeline_id,
             run_update=PipelineRunUpdate(
@@ -164,19 +449,35 @@ async def run_pipeline_task(
 
         # Update pipeline run as failed
         if run_id:
-            await pipeline_service.update_pipeline_run(
+            await update_pipeline_run_status(
                 run_id,
                 pipeline_id=pipeline_id,
                 run_update=PipelineRunUpdate(
                     status=PipelineRunStatus.FAILED,
-                    end_time=datetime.now(timezone.utc).isoformat(),
+                    end_time=utcnow_iso(),
                     error_message=error_message,
                 ),
             )
+            await step_service.cancel_pending_step_runs(run_id)
 
         return False
 
 
+def parse_step_inputs(step: Dict[str, Any]) -> List[str]:
+    """
+    Get the ids of the steps a step depends on. Steps loaded straight from
+    the database hold them as a comma-separated string; the parsed list is
+    kept on the step so it is only split once.
+    """
+    if "_inputs" not in step:
+        inputs = step.get("inputs") or []
+        if isinstance(inputs, str):
+            inputs = inputs.split(",")
+        step["_inputs"] = [i.strip() for i in inputs if i.strip()]
+
+    return step["_inputs"]
+
+
 def organize_steps_by_dependency_levels(
     steps: List[Dict[str, Any]],
 ) -> List[List[Dict[str, Any]]]:
@@ -192,47 +493,269 @@ def organize_steps_by_dependency_levels(
     # Create step lookup
     step_map = {step["id"]: step for step in steps}
 
-    # Track processed steps
-    processed = set()
-    levels = []
-
-    while len(processed) < len(steps):
-        current_level = []
-
-        for step in steps:
-            step_id = step["id"]
-
-            # Skip if already processed
-            if step_id in processed:
-                continue
+    # Count unmet dependencies per step and index steps by what they depend on
+    pending_dependencies = {}
+    dependents = defaultdict(list)
+    for step in steps:
+        dependencies = set(parse_step_inputs(step))
+        pending_dependencies[step["id"]] = len(dependencies)
+        for dependency in dependencies:
+            dependents[dependency].append(step["id"])
 
-            # Check if all dependencies are satisfied
-            dependencies = set(step.get("inputs", []))
-            if dependencies.issubset(processed):
-                current_level.append(step)
-
-        if not current_level:
-            # No progress made - circular dependency
-            remaining = [s["id"] for s in steps if s["id"] not in processed]
-            raise Exception(f"Circular dependency detected among steps: {remaining}")
+    # Kahn's algorithm, one level at a time
+    levels = []
+    processed = 0
+    current_level = [step for step in steps if not pending_dependencies[step["id"]]]
 
+    while current_level:
         # Sort current level by run_order
         current_level.sort(key=lambda x: x.get("run_order", 0))
         levels.append(current_level)
+        processed += len(current_level)
 
-        # Mark as processed
+        next_level = []
         for step in current_level:
-            processed.add(step["id"])
+            for dependent_id in dependents[step["id"]]:
+                pending_dependencies[dependent_id] -= 1
+                if not pending_dependencies[dependent_id]:
+                    next_level.append(step_map[dependent_id])
+        current_level = next_level
+
+    if processed < len(steps):
+        # Steps never released depend on a cycle or on unknown steps
+        blocked = {s["id"] for s in steps if pending_dependencies[s["id"]]}
+
+        cycle = find_dependency_cycle(blocked, dependents)
+        if cycle:
+            raise CircularDependencyError(cycle)
+
+        unknown = sorted(
+            {
+                dependency
+                for s in steps
+                if s["id"] in blocked
+                for dependency in parse_step_inputs(s)
+                if dependency not in step_map
+            }
+        )
+        raise Exception(f"Steps {sorted(blocked)} depend on unknown steps {unknown}")
 
     return levels
 
 
+class CircularDependencyError(Exception):
+    """Raised when pipeline steps depend on each other in a cycle"""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(
+            "Circular dependency detected among steps: "
+            + " -> ".join(cycle + cycle[:1])
+        )
+
+
+def find_dependency_cycle(
+    step_ids: Set[str], dependents: Dict[str, List[str]]
+) -> List[str]:
+    """
+    Find the smallest dependency cycle among the given steps. Strongly
+    connected components are found with an iterative Tarjan's algorithm.
+
+    Args:
+        step_ids: Steps to search
+        dependents: Step ids depending on each step
+
+    Returns:
+        Step ids along the cycle, each feeding the next, or an empty list
+    """
+
+    def successors(step_id: str) -> List[str]:
+        return [d for d in dependents.get(step_id, []) if d in step_ids]
+
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    components: List[List[str]] = []
+
+    for root in step_ids:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+
+        while work:
+            node, children = work[-1]
+
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors(child))))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    cycles = [
+        component
+        for component in components
+        if len(component) > 1 or component[0] in successors(component[0])
+    ]
+    if not cycles:
+        return []
+
+    # Walk the smallest component breadth-first back to its first step
+    members = set(min(cycles, key=len))
+    start = min(members)
+    parents: Dict[str, Optional[str]] = {start: None}
+    queue = deque([start])
+
+    while queue:
+        node = queue.popleft()
+        for child in successors(node):
+            if child == start:
+                path = [node]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                return path[::-1]
+            if child in members and child not in parents:
+                parents[child] = node
+                queue.append(child)
+
+    return sorted(members)
+
+
+async def run_pipeline_inline(
+    dependency_levels: List[List[Dict[str, Any]]], pipeline_id: str, run_id: str
+) -> Dict[str, Any]:
+    """
+    Run all steps inside the orchestrator task, level by level, instead of
+    dispatching them as Celery subtasks.
+
+    Args:
+        dependency_levels: Steps organized by dependency levels
+        pipeline_id: Pipeline ID
+        run_id: Pipeline run ID
+
+    Returns:
+        Summary of the run
+    """
+    # Datasource lookups do not depend on step outputs. Start them all now so
+    # that steps of later levels find theirs ready instead of waiting for the
+    # earlier levels to finish first.
+    datasource_ids = {
+        (step.get("config") or {}).get("datasource_id")
+        for level_steps in dependency_levels
+        for step in level_steps
+    }
+    prefetches = [
+        asyncio.create_task(prefetch_datasource(datasource_id))
+        for datasource_id in datasource_ids
+        if datasource_id
+    ]
+
+    try:
+        for level_idx, level_steps in enumerate(dependency_levels):
+            # Let every step of the level finish, as the chord of the Celery
+            # workflow does, before reporting the first failure
+            results = await asyncio.gather(
+                *[
+                    execute_pipeline_step(
+                        pipeline_id, step["id"], run_id, level_idx, step
+                    )
+                    for step in level_steps
+                ],
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+
+        await finish_pipeline_run(pipeline_id, run_id)
+    finally:
+        # Prefetches left running would outlive the run on the shared loop
+        for prefetch in prefetches:
+            prefetch.cancel()
+        await asyncio.gather(*prefetches, return_exceptions=True)
+
+    return {
+        "workflow_started": False,
+        "inline": True,
+        "dependency_levels": len(dependency_levels),
+        "total_steps": sum(len(level) for level in dependency_levels),
+    }
+
+
+# Queues of the step types that do not share the default steps queue. Steps
+# whose work runs on the CPU rather than awaiting I/O go to a prefork worker
+# so they do not hold the GIL of the threaded step workers. Long-running
+# steps (LLM calls, graph writes, external APIs) get their own workers so
+# that short steps are not queued behind a burst of them.
+CPU_STEPS_QUEUE = "steps_cpu"
+HEAVY_STEPS_QUEUE = "steps_heavy"
+STEP_QUEUES: Dict[str, str] = {
+    PipelineStepType.CUSTOM_PYTHON: CPU_STEPS_QUEUE,
+    PipelineStepType.LLM_ENTITY_EXTRACTOR: HEAVY_STEPS_QUEUE,
+    PipelineStepType.KNOWLEDGE_GRAPH_WRITER: HEAVY_STEPS_QUEUE,
+    PipelineStepType.API_FETCHER: HEAVY_STEPS_QUEUE,
+}
+
+
+def step_task_signature(
+    step: Dict[str, Any], pipeline_id: str, run_id: str, level_index: int
+):
+    """
+    Build the immutable signature running a step, routed by its step type.
+
+    Args:
+        step: Step data
+        pipeline_id: Pipeline ID
+        run_id: Pipeline run ID
+        level_index: Dependency level of the step
+
+    Returns:
+        Celery signature of run_pipeline_step_task
+    """
+    task_sig = run_pipeline_step_task.si(
+        pipeline_id=pipeline_id,
+        step_id=step["id"],
+        pipeline_run_id=run_id,
+        level_index=level_index,
+        step=step,
+    )
+    queue = STEP_QUEUES.get(step["step_type"])
+    if queue:
+        task_sig.set(queue=queue)
+    return task_sig
+
+
 def create_pipeline_workflow(
     dependency_levels: List[List[Dict[str, Any]]], pipeline_id: str, run_id: str
 ):
     """
     Create Celery workflow for pipeline execution.
     No data is passed between tasks - everything is retrieved from database.
+    Each step task receives its already parsed step so it does not have to
+    load it again.
 
     Args:
         dependency_levels: Steps organized by dependency levels
@@ -242,7 +765,12 @@ def create_pipeline_workflow(
     Returns:
         Celery workflow (chain/group/chord)
     """
-    from celery import chain, chord, group
+    # Link the errback to every step task itself, so any failing step fails
+    # the run. Linking it to the chain would not reach the steps of parallel
+    # levels: the chain turns each of them into the header of a chord, and a
+    # chord only links errbacks to its body. The errback is immutable and
+    # ignores the failure details Celery passes to errbacks.
+    errback = fail_pipeline_run.si(pipeline_id=pipeline_id, pipeline_run_id=run_id)
 
     workflow_tasks = []
 
@@ -250,39 +778,28 @@ def create_pipeline_workflow(
         if len(level_steps) == 1:
             # Single step - add to chain directly
             step = level_steps[0]
-            task_sig = run_pipeline_step_task.si(
-                pipeline_id=pipeline_id,
-                step_id=step["id"],
-                pipeline_run_id=run_id,
-                level_index=level_idx,
-            )
+            task_sig = step_task_signature(step, pipeline_id, run_id, level_idx)
+            task_sig.link_error(errback)
             workflow_tasks.append(task_sig)
 
         else:
             # Multiple steps in parallel - use group
             parallel_tasks = []
             for step in level_steps:
-                task_sig = run_pipeline_step_task.si(
-                    pipeline_id=pipeline_id,
-                    step_id=step["id"],
-                    pipeline_run_id=run_id,
-                    level_index=level_idx,
-                )
+                task_sig = step_task_signature(step, pipeline_id, run_id, level_idx)
+                task_sig.link_error(errback)
                 parallel_tasks.append(task_sig)
 
-            # Use chord to wait for all parallel tasks to complete
-            level_group = group(*parallel_tasks)
-            level_callback = level_completion_callback.si(
-                pipeline_id=pipeline_id, pipeline_run_id=run_id, level_index=level_idx
-            )
-            workflow_tasks.append(chord(level_group)(level_callback))
+            # The chain turns a group followed by another task into a chord
+            # with that task as its body, so the next level only starts once
+            # every step of this one has completed
+            workflow_tasks.append(group(*parallel_tasks))
 
-    # Add final completion task
+    # Add final completion task. It records its own failures on the run.
     workflow_tasks.append(
         complete_pipeline.si(pipeline_id=pipeline_id, pipeline_run_id=run_id)
     )
 
-    # Create the main chain
     return chain(*workflow_tasks)
 
 
@@ -294,6 +811,7 @@ async def run_pipeline_step_task(
     step_id: str,
     pipeline_run_id: str,
     level_index: int = 0,
+    step: Optional[Dict[str, Any]] = None,
 ):
     """
     Execute a single pipeline step with dependency resolution from database.
@@ -304,12 +822,25 @@ async def run_pipeline_step_task(
         step_id: ID of the step to run
         pipeline_run_id: ID of the pipeline run
         level_index: Dependency level index
+        step: Step as loaded by the orchestrator, fetched by ID when omitted
     """
-    from app.services.pipeline import PipelineService
-    from app.services.pipeline_step import PipelineStepService
+    return await execute_pipeline_step(
+        pipeline_id, step_id, pipeline_run_id, level_index, step
+    )
 
-    step_service = PipelineStepService()
-    pipeline_service = PipelineService()
+
+async def execute_pipeline_step(
+    pipeline_id: str,
+    step_id: str,
+    pipeline_run_id: str,
+    level_index: int = 0,
+    step: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run a step and record its step run, either inside its own Celery task or
+    inline in the orchestrator.
+    """
+    step_service = get_step_service()
     step_run_id = None
 
     try:
@@ -317,25 +848,22 @@ async def run_pipeline_step_task(
             f"Starting step {step_id} in pipeline {pipeline_id} (level {level_index})"
         )
 
-        # Get step details
-        step = await step_service.get_pipeline_step(step_id, pipeline_id)
+        # Get step details, unless the orchestrator already sent them
+        if step is None:
+            step = await step_service.get_pipeline_step(step_id, pipeline_id)
+        # Known from the start when the orchestrator created the step run, so
+        # that failures resolving the inputs are recorded on it as well
+        step_run_id = step.get("step_run_id")
         step_type = step["step_type"]
-        config = (
-            json.loads(step["config"])
-            if isinstance(step["config"], str)
-            else step["config"]
-        )
+        config = step["config"]
 
         logger.info(
             f"Step type: {step_type}, config: {config}, inputs: {step['inputs']}"
         )
 
-        # Wait for dependencies to complete (if any)
-        await wait_for_dependencies(step, pipeline_run_id)
-
-        logger.info(f"Dependencies ready for step {step_id}")
-
-        # Resolve input data from dependencies (retrieved from database)
+        # Resolve input data from dependencies (retrieved from database).
+        # Dependencies always sit in an earlier level, and the workflow only
+        # starts a level once the previous one has completed.
         resolved_input_data = await resolve_step_input_data_from_db(
             step, pipeline_run_id
         )
@@ -351,46 +879,73 @@ async def run_pipeline_step_task(
             "status": StepStatus.RUNNING,
             "run_order": step["run_order"],
             "input_data": resolved_input_data,
-            "celery_task_id": self.request.id,
-            "start_time": datetime.now(timezone.utc).isoformat(),
+            "celery_task_id": current_task_id.get(),
+            "start_time": utcnow_iso(),
         }
 
-        step_run = await step_service.create_step_run(step_run_data)
-        step_run_id = step_run["id"]
+        if step_run_id:
+            # The orchestrator already created the step run. The update is
+            # only queued, so for quick steps it is merged into the final one.
+            await get_status_writer().put(
+                "pipeline_step_runs", step_run_id, step_run_data
+            )
 
-        logger.info(f"Step run created with ID {step_run_id}")
+            # Execute step based on type
+            output_data = await execute_step_by_type(
+                step_type, config, resolved_input_data
+            )
+        else:
+            # Insert the step run while the step starts executing. The insert
+            # is awaited even if the step fails so that the failure can be
+            # recorded.
+            step_run_insert = asyncio.create_task(
+                step_service.create_step_run(step_run_data)
+            )
 
-        # Execute step based on type
-        output_data = await execute_step_by_type(step_type, config, resolved_input_data)
+            try:
+                # Execute step based on type
+                output_data = await execute_step_by_type(
+                    step_type, config, resolved_input_data
+                )
+            finally:
+                step_run = await step_run_insert
+                step_run_id = step_run["id"]
 
+                logger.info(f"Step run created with ID {step_run_id}")
+
+        # Rendering the whole output just to measure it can cost megabytes
         logger.info(
-            f"Step {step_id} executed successfully, output size: {len(str(output_data))} characters"
+            f"Step {step_id} executed successfully, output keys: {list(output_data)}"
         )
 
         # Update step run as completed
-        await step_service.update_pipeline_step_run(
-            step_run_id=step_run_id,
-            pipeline_run_id=pipeline_run_id,
-            step_run_in={
+        # Terminal statuses are flushed before returning: dependent steps read
+        # them from the database as soon as this task finishes
+        status_update = get_status_writer().write(
+            "pipeline_step_runs",
+            step_run_id,
+            {
                 "status": StepStatus.COMPLETED,
-                "end_time": datetime.now(timezone.utc).isoformat(),
+                "end_time": utcnow_iso(),
                 "output_data": output_data,
             },
         )
+        if step.get("has_dependents", True):
+            await asyncio.gather(
+                status_update,
+                share_step_output(pipeline_run_id, step_id, output_data),
+            )
+        else:
+            await status_update
 
         logger.info(f"Step {step_id} completed successfully")
 
-        # Return minimal data - just status info, no large output data
+        # Return minimal data; it is only kept until the chord of the level
+        # joins it. Outputs reach dependent steps through the database.
         return {
             "status": StepStatus.COMPLETED,
             "step_run_id": step_run_id,
             "step_id": step_id,
-            "level_index": level_index,
-            "pipeline_id": pipeline_id,
-            "pipeline_run_id": pipeline_run_id,
-            "output_size": (
-                len(str(output_data)) if output_data else 0
-            ),  # Just for logging
         }
 
     except Exception as e:
@@ -399,130 +954,140 @@ async def run_pipeline_step_task(
 
         # Update step run as failed
         if step_run_id:
-            await step_service.update_pipeline_step_run(
-                step_run_id=step_run_id,
-                pipeline_run_id=pipeline_run_id,
-                step_run_in={
+            await get_status_writer().write(
+                "pipeline_step_runs",
+                step_run_id,
+                {
                     "status": StepStatus.FAILED,
-                    "end_time": datetime.now(timezone.utc).isoformat(),
+                    "end_time": utcnow_iso(),
                     "error_message": error_message,
                 },
             )
 
-        # Update pipeline as failed
-        pipeline_service = PipelineService()
-        await pipeline_service.update_pipeline_run(
-            pipeline_run_id,
-            pipeline_id=pipeline_id,
-            run_update=PipelineRunUpdate(
-                status=PipelineRunStatus.FAILED,
-                end_time=datetime.now(timezone.utc).isoformat(),
-                error_message=error_message,
-            ),
-        )
-
+        # The pipeline run itself is marked as failed once, by the workflow
+        # errback or, for inline runs, by run_pipeline_task
         raise Exception(f"Step {step_id} execution failed: {error_message}")
 
+    except asyncio.CancelledError:
+        # Cancelled at the task time limit; the errback reads the failure
+        # from the step run
+        logger.error(f"Step {step_id} was cancelled")
+
+        if step_run_id:
+            await get_status_writer().write(
+                "pipeline_step_runs",
+                step_run_id,
+                {
+                    "status": StepStatus.FAILED,
+                    "end_time": utcnow_iso(),
+                    "error_message": "Step execution timed out",
+                },
+            )
+        raise
+
 
-async def wait_for_dependencies(
-    step: Dict[str, Any],
+# Keys of the dependency outputs each step type reads. Only these are loaded
+# from the database; types not listed receive every key.
+STEP_INPUT_KEYS: Dict[str, Tuple[str, ...]] = {
+    PipelineStepType.TEXT_EXTRACTOR: ("file_content", "file_id"),
+    PipelineStepType.LLM_ENTITY_EXTRACTOR: ("text_chunks", "file_id"),
+    PipelineStepType.ENTITY_RESOLUTION: ("entities", "relationships", "extraction_id"),
+    PipelineStepType.FIBO_MAPPER: (
+        "entities",
+        "resolved_entities",
+        "relationships",
+        "extraction_id",
+    ),
+    PipelineStepType.KNOWLEDGE_GRAPH_WRITER: (
+        "mapped_entities",
+        "mapped_relationships",
+        "unmapped_entities",
+        "unmapped_relationships",
+        "extraction_id",
+    ),
+}
+
+
+# Lookups of completed step runs, shared by the steps of a level that resolve
+# their inputs at the same time. Completed runs no longer change, so finished
+# lookups are reused for a short while. Entries are (started_at, lookup).
+STEP_RUNS_CACHE_TTL = 2.0
+_step_run_lookups: Dict[tuple, Tuple[float, asyncio.Future]] = {}
+
+
+async def pick_step_run(
+    batch: asyncio.Future, step_id: str
+) -> Optional[Dict[str, Any]]:
+    """Get the run of one step from a lookup of several steps"""
+    # Shielded so that a cancelled caller does not cancel the whole batch
+    step_runs = await asyncio.shield(batch)
+    return step_runs.get(step_id)
+
+
+async def get_completed_step_runs(
     pipeline_run_id: str,
-    timeout: int = 90,  # 1 hour timeout
-    check_interval: int = 5,  # Check every 5 seconds
-) -> bool:
+    step_ids: List[str],
+    output_keys: Optional[Tuple[str, ...]] = None,
+) -> Dict[str, Dict[str, Any]]:
     """
-    Wait for step dependencies to complete before executing current step.
+    Get the completed runs of the given steps, looking up all those not
+    already being looked up in one query. Callers asking for the same step
+    share one lookup.
 
     Args:
-        step: Step configuration
         pipeline_run_id: Pipeline run ID
-        timeout: Maximum wait time in seconds
-        check_interval: Check interval in seconds
+        step_ids: Steps to get the completed runs of
+        output_keys: Keys of output_data to fetch, all of them when None
 
     Returns:
-        True if dependencies are ready, raises exception if timeout or failure
+        Completed step runs by step ID; steps without one are left out
     """
-    # split by comma and strip whitespace
-    step_inputs = step.get("inputs", [])
-    if isinstance(step_inputs, str) and step_inputs:
-        step_inputs = [s.strip() for s in step_inputs.split(",")]
-
-    logger.info(
-        f"Waiting for dependencies for step {step['id']} - inputs: {step_inputs}"
-    )
-
-    if not step_inputs:
-        return True  # No dependencies
-
-    from app.services.pipeline_step import PipelineStepService
-
-    step_service = PipelineStepService()
-
-    start_time = datetime.now(timezone.utc)
-
-    while True:
-        try:
-            # Get all step runs for this pipeline run
-            logger.info(
-                f"Checking dependencies for step {step['id']} - pipeline run ID: {pipeline_run_id}"
+    now = time.monotonic()
+    for key, (started_at, _) in list(_step_run_lookups.items()):
+        if now - started_at >= STEP_RUNS_CACHE_TTL:
+            del _step_run_lookups[key]
+
+    missing_step_ids = [
+        step_id
+        for step_id in step_ids
+        if (pipeline_run_id, step_id, output_keys) not in _step_run_lookups
+    ]
+    if missing_step_ids:
+        batch = asyncio.ensure_future(
+            get_step_service().get_completed_step_runs(
+                pipeline_run_id, missing_step_ids, output_keys
             )
-            step_runs_response = await step_service.get_pipeline_step_runs(
-                pipeline_run_id
-            )
-            logger.info(
-                f"Step runs response: {step_runs_response.data if step_runs_response else 'No data'}"
-            )
-            step_runs = step_runs_response.data if step_runs_response else []
-            logger.info(f"Step runs: {step_runs}")
-
-            # Create lookup map: step_id -> step_run
-            step_run_map = {}
-            for run in step_runs:
-                step_run_map[run["step_id"]] = run
-
-            logger.info(
-                f"Checking dependencies for step {step['id']} - found {len(step_run_map)} step runs"
+        )
+        for step_id in missing_step_ids:
+            _step_run_lookups[(pipeline_run_id, step_id, output_keys)] = (
+                now,
+                asyncio.ensure_future(pick_step_run(batch, step_id)),
             )
 
-            # Check dependency status
-            all_ready = True
-            failed_deps = []
-
-            for dep_step_id in step_inputs:
-                if dep_step_id not in step_run_map:
-                    all_ready = False
-                    logger.info(f"Dependency {dep_step_id} not started yet")
-                    break
-
-                dep_status = step_run_map[dep_step_id]["status"]
-
-                if dep_status == StepStatus.FAILED:
-                    failed_deps.append(dep_step_id)
-                elif dep_status != StepStatus.COMPLETED:
-                    all_ready = False
-                    logger.info(f"Dependency {dep_step_id} status: {dep_status}")
-                    break
-
-            if failed_deps:
-                raise Exception(f"Dependencies failed: {failed_deps}")
-
-            if all_ready:
-                logger.info(f"All dependencies ready for step {step['id']}")
-                return True
-
-            # Check timeout
-            elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
-            if elapsed > timeout:
-                raise Exception(f"Timeout waiting for dependencies: {step_inputs}")
+    lookups = [
+        _step_run_lookups[(pipeline_run_id, step_id, output_keys)][1]
+        for step_id in step_ids
+    ]
+
+    results = await asyncio.gather(*lookups, return_exceptions=True)
+
+    step_runs = {}
+    errors = []
+    for step_id, lookup, result in zip(step_ids, lookups, results):
+        if isinstance(result, Exception) or result is None:
+            # Only completed runs may be reused
+            key = (pipeline_run_id, step_id, output_keys)
+            if key in _step_run_lookups and _step_run_lookups[key][1] is lookup:
+                del _step_run_lookups[key]
+            if isinstance(result, Exception):
+                errors.append(result)
+        else:
+            step_runs[step_id] = result
 
-            # Wait before next check
-            await asyncio.sleep(check_interval)
+    if errors:
+        raise errors[0]
 
-        except Exception as e:
-            if "Dependencies failed" in str(e) or "Timeout waiting" in str(e):
-                raise
-            logger.warning(f"Error checking dependencies: {str(e)}")
-            await asyncio.sleep(check_interval)
+    return step_runs
 
 
 async def resolve_step_input_data_from_db(
@@ -539,46 +1104,50 @@ async def resolve_step_input_data_from_db(
         Resolved input data with dependency outputs
     """
     input_data = {}
-    step_inputs = step.get("inputs", [])
-
-    if isinstance(step_inputs, str) and step_inputs:
-        # Split by comma and strip whitespace
-        step_inputs = [s.strip() for s in step_inputs.split(",")]
+    step_inputs = parse_step_inputs(step)
 
     if not step_inputs:
         return input_data
 
-    from app.services.pipeline_step import PipelineStepService
-
-    step_service = PipelineStepService()
+    output_keys = STEP_INPUT_KEYS.get(step["step_type"])
 
     try:
-        # Get all completed step runs for this pipeline run
-        step_runs_response = await step_service.get_pipeline_step_runs(pipeline_run_id)
-        step_runs = step_runs_response.data if step_runs_response else []
+        # Outputs shared through Redis save reading them from the database
+        shared_outputs = await get_shared_step_outputs(pipeline_run_id, step_inputs)
 
         # Create lookup map: step_id -> step_run for completed steps only
         step_run_map = {}
-        for run in step_runs:
-            if run["status"] == StepStatus.COMPLETED:
-                step_run_map[run["step_id"]] = run
+        missing_step_ids = [
+            dep_step_id
+            for dep_step_id in step_inputs
+            if dep_step_id not in shared_outputs
+        ]
+        if missing_step_ids:
+            step_run_map = await get_completed_step_runs(
+                pipeline_run_id, missing_step_ids, output_keys
+            )
 
         # Gather input data from dependencies
         for dep_step_id in step_inputs:
-            if dep_step_id in step_run_map:
+            if dep_step_id in shared_outputs:
+                dep_output = shared_outputs[dep_step_id]
+            elif dep_step_id in step_run_map:
                 dep_output = step_run_map[dep_step_id].get("output_data", {})
-                if dep_output:
-                    # Add with step prefix for clear identification
-                    for key in dep_output:
-                        input_data[key] = dep_output[key]
-
-                    logger.info(
-                        f"Added dependency data from step {dep_step_id} (size: {len(str(dep_output))} chars)"
-                    )
             else:
                 logger.warning(
                     f"Dependency step {dep_step_id} not found or not completed"
                 )
+                continue
+
+            if dep_output:
+                # Add with step prefix for clear identification
+                for key in dep_output:
+                    if output_keys is None or key in output_keys:
+                        input_data[key] = dep_output[key]
+
+                logger.info(
+                    f"Added dependency data from step {dep_step_id} (keys: {list(dep_output)})"
+                )
 
         return input_data
 
@@ -587,74 +1156,89 @@ async def resolve_step_input_data_from_db(
         return input_data
 
 
-@celery_app.task(name="level_completion_callback")
-@async_task
-async def level_completion_callback(
-    level_results: List[Dict[str, Any]],
-    pipeline_id: str,
-    pipeline_run_id: str,
-    level_index: int,
-):
-    """
-    Callback task executed after completing a dependency level.
+def step_output_key(pipeline_run_id: str, step_id: str) -> str:
+    """Redis key under which a step output is shared with its dependents"""
+    return f"step-output:{pipeline_run_id}:{step_id}"
 
-    Args:
-        level_results: Results from all steps in the level (minimal data)
-        pipeline_id: Pipeline ID
-        pipeline_run_id: Pipeline run ID
-        level_index: Level index that was completed
-    """
+
+async def share_step_output(
+    pipeline_run_id: str, step_id: str, output_data: Dict[str, Any]
+) -> None:
+    """Store a step output once in Redis for all steps that consume it"""
     try:
-        logger.info(
-            f"Completed dependency level {level_index} for pipeline {pipeline_id}"
+        redis_client = await get_redis()
+        await redis_client.setex(
+            step_output_key(pipeline_run_id, step_id),
+            settings.PIPELINE_MAX_EXECUTION_TIME,
+            serialization.dumps(output_data),
         )
+    except Exception as e:
+        logger.warning(f"Sharing output of step {step_id} failed: {str(e)}")
 
-        completed_steps = []
-        failed_steps = []
-
-        for result in level_results:
-            if result.get("status") == StepStatus.COMPLETED:
-                completed_steps.append(result["step_id"])
-            else:
-                failed_steps.append(result["step_id"])
 
-        if failed_steps:
-            error_message = f"Level {level_index} failed - steps: {failed_steps}"
-            logger.error(error_message)
+async def get_shared_step_outputs(
+    pipeline_run_id: str, step_ids: List[str]
+) -> Dict[str, Any]:
+    """Get the shared outputs available in Redis for the given steps"""
+    try:
+        redis_client = await get_redis()
+        values = await redis_client.mget(
+            [step_output_key(pipeline_run_id, step_id) for step_id in step_ids]
+        )
+    except Exception as e:
+        logger.warning(f"Shared step output lookup failed: {str(e)}")
+        return {}
 
-            # Update pipeline as failed
-            from app.services.pipeline import PipelineService
+    return {
+        step_id: serialization.loads(value)
+        for step_id, value in zip(step_ids, values)
+        if value is not None
+    }
 
-            pipeline_service = PipelineService()
-            await pipeline_service.update_pipeline_run(
-                pipeline_run_id,
-                pipeline_id=pipeline_id,
-                run_update=PipelineRunUpdate(
-                    status=PipelineRunStatus.FAILED,
-                    end_time=datetime.now(timezone.utc).isoformat(),
-                    error_message=error_message,
-                ),
-            )
 
-            raise Exception(error_message)
+@celery_app.task(name="fail_pipeline_run", ignore_result=True)
+@async_task
+async def fail_pipeline_run(
+    pipeline_id: str,
+    pipeline_run_id: str,
+):
+    """
+    Errback of the pipeline workflow, marking the run as failed when one of
+    its tasks fails.
 
-        logger.info(f"Level {level_index} completed successfully: {completed_steps}")
+    It is linked as an immutable signature, which drops the request,
+    exception and traceback Celery passes to errbacks, and reads the error
+    from the failed step run instead.
 
-        # Return minimal status data
-        return {
-            "level_completed": True,
-            "level_index": level_index,
-            "completed_count": len(completed_steps),
-            "pipeline_id": pipeline_id,
-            "pipeline_run_id": pipeline_run_id,
-        }
+    Args:
+        pipeline_id: Pipeline ID
+        pipeline_run_id: Pipeline run ID
+    """
+    step_service = get_step_service()
 
-    except Exception as e:
-        logger.error(f"Level completion callback failed: {str(e)}")
-        raise
+    failed_step_run = await step_service.get_failed_step_run(pipeline_run_id)
+    if failed_step_run:
+        error_message = (
+            f"Pipeline execution failed: Step {failed_step_run['step_id']} "
+            f"execution failed: {failed_step_run.get('error_message')}"
+        )
+    else:
+        error_message = "Pipeline execution failed"
+    logger.error(f"Pipeline {pipeline_id} failed: {error_message}")
+
+    await update_pipeline_run_status(
+        pipeline_run_id,
+        pipeline_id=pipeline_id,
+        run_update=PipelineRunUpdate(
+            status=PipelineRunStatus.FAILED,
+            end_time=utcnow_iso(),
+            error_message=error_message,
+        ),
+    )
+    await step_service.cancel_pending_step_runs(pipeline_run_id)
 
 
-@celery_app.task(name="complete_pipeline")
+@celery_app.task(name="complete_pipeline", ignore_result=True)
 @async_task
 async def complete_pipeline(
     pipeline_id: str,
@@ -667,20 +1251,22 @@ async def complete_pipeline(
         pipeline_id: Pipeline ID
         pipeline_run_id: Pipeline run ID
     """
-    try:
-        logger.info(f"Completing pipeline {pipeline_id}")
+    return await finish_pipeline_run(pipeline_id, pipeline_run_id)
 
-        from app.services.pipeline import PipelineService
 
-        pipeline_service = PipelineService()
+async def finish_pipeline_run(pipeline_id: str, pipeline_run_id: str) -> Dict[str, Any]:
+    """Mark a pipeline run as completed once all of its steps have run"""
+    try:
+        logger.info(f"Completing pipeline {pipeline_id}")
+        end_time = utcnow_iso()
 
         # Update pipeline run status to completed
-        await pipeline_service.update_pipeline_run(
+        await update_pipeline_run_status(
             pipeline_run_id,
             pipeline_id=pipeline_id,
             run_update=PipelineRunUpdate(
                 status=PipelineRunStatus.COMPLETED,
-                end_time=datetime.now(timezone.utc).isoformat(),
+                end_time=end_time,
             ),
         )
 
@@ -690,7 +1276,7 @@ async def complete_pipeline(
             "pipeline_completed": True,
             "pipeline_id": pipeline_id,
             "pipeline_run_id": pipeline_run_id,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": end_time,
         }
 
     except Exception as e:
@@ -698,15 +1284,12 @@ async def complete_pipeline(
         logger.error(error_message)
 
         # Update as failed
-        from app.services.pipeline import PipelineService
-
-        pipeline_service = PipelineService()
-        await pipeline_service.update_pipeline_run(
+        await update_pipeline_run_status(
             pipeline_run_id,
             pipeline_id=pipeline_id,
             run_update=PipelineRunUpdate(
                 status=PipelineRunStatus.FAILED,
-                end_time=datetime.now(timezone.utc).isoformat(),
+                end_time=utcnow_iso(),
                 error_message=error_message,
             ),
         )
@@ -714,6 +1297,67 @@ async def complete_pipeline(
         raise Exception(error_message)
 
 
+# Step types whose output is a pure function of (config, input_data). Steps
+# that write to the database or read external sources must not be cached;
+# FIBO_MAPPER reads the mapping tables, which can be edited between runs.
+CACHEABLE_STEP_TYPES = {
+    PipelineStepType.TEXT_EXTRACTOR,
+}
+
+
+def step_cache_key(
+    step_type: str, config: Dict[str, Any], input_data: Optional[Dict[str, Any]]
+) -> str:
+    """Build the causal cache key of a step from its type, config and inputs"""
+    payload = "\0".join(
+        [
+            PipelineStepType(step_type).value,
+            serialization.dumps(config, sort_keys=True),
+            serialization.dumps(input_data or {}, sort_keys=True),
+        ]
+    )
+    return "step-cache:" + hashlib.sha256(payload.encode()).hexdigest()
+
+
+def causal_cache(func):
+    """Reuse the output of pure steps that already ran with the same inputs."""
+
+    @wraps(func)
+    async def wrapper(
+        step_type: str,
+        config: Dict[str, Any],
+        input_data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        ttl = settings.PIPELINE_STEP_CACHE_TTL
+        if ttl <= 0 or step_type not in CACHEABLE_STEP_TYPES:
+            return await func(step_type, config, input_data)
+
+        key = step_cache_key(step_type, config, input_data)
+
+        try:
+            redis_client = await get_redis()
+            cached = await redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"Step cache lookup failed: {str(e)}")
+            return await func(step_type, config, input_data)
+
+        if cached:
+            logger.info(f"Step cache hit for {step_type} ({key})")
+            return serialization.loads(cached)
+
+        output_data = await func(step_type, config, input_data)
+
+        try:
+            await redis_client.setex(key, ttl, serialization.dumps(output_data))
+        except Exception as e:
+            logger.warning(f"Step cache store failed: {str(e)}")
+
+        return output_data
+
+    return wrapper
+
+
+@causal_cache
 async def execute_step_by_type(
     step_type: str, config: Dict[str, Any], input_data: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
@@ -728,36 +1372,12 @@ async def execute_step_by_type(
     Returns:
         Output data from step execution
     """
-    try:
-        if step_type == PipelineStepType.FILE_READER:
-            return await execute_file_reader_step(config, input_data)
-
-        elif step_type == PipelineStepType.API_FETCHER:
-            return await execute_api_fetcher_step(config, input_data)
-
-        elif step_type == PipelineStepType.DATABASE_EXTRACTOR:
-            return await execute_database_extractor_step(config, input_data)
-
-        elif step_type == PipelineStepType.TEXT_EXTRACTOR:
-            return await execute_text_extractor_step(config, input_data)
+    handler = _STEP_DISPATCH.get(step_type)
+    if handler is None:
+        raise ValueError(f"Unknown step type: {step_type}")
 
-        elif step_type == PipelineStepType.LLM_ENTITY_EXTRACTOR:
-            return await execute_llm_entity_extractor_step(config, input_data)
-
-        elif step_type == PipelineStepType.ENTITY_RESOLUTION:
-            return await execute_entity_resolution_step(config, input_data)
-
-        elif step_type == PipelineStepType.FIBO_MAPPER:
-            return await execute_fibo_mapper_step(config, input_data)
-
-        elif step_type == PipelineStepType.KNOWLEDGE_GRAPH_WRITER:
-            return await execute_knowledge_graph_writer_step(config, input_data)
-
-        elif step_type == PipelineStepType.CUSTOM_PYTHON:
-            return await execute_custom_python_step(config, input_data)
-
-        else:
-            raise ValueError(f"Unknown step type: {step_type}")
+    try:
+        return await handler(config, input_data)
 
     except Exception as e:
         logger.error(f"Error executing step type {step_type}: {str(e)}")
@@ -798,38 +1418,33 @@ async def execute_text_extractor_step(
     if not file_content:
         raise ValueError("No text content available from file reader step")
 
-    # Get file content from previous step (file reader)
-
-    logger.info(
-        f"Chunking text content of size {len(input_data['file_content']['content']['text'])} characters"
-    )
-
+    character_count = len(file_content)
     file_id = input_data.get("file_id")
 
-    logger.info(f"Chunking text content of size {len(file_content)} characters")
+    logger.info(f"Chunking text content of size {character_count} characters")
 
     try:
         # Simply chunk the text content
-        text_chunks = chunk_text(file_content, chunk_size, chunk_overlap)
+        text_chunks = list(iter_chunks(file_content, chunk_size, chunk_overlap))
+        now = utcnow_iso()
 
         # Create simple metadata
         metadata = {
             "total_chunks": len(text_chunks),
-            "total_characters": len(file_content),
+            "total_characters": character_count,
             "chunk_size": chunk_size,
             "chunk_overlap": chunk_overlap,
-            "extraction_date": datetime.now(timezone.utc).isoformat(),
+            "extraction_date": now,
         }
 
         return {
             "text_chunks": text_chunks,
-            "full_text": file_content,
             "chunk_count": len(text_chunks),
-            "character_count": len(file_content),
+            "character_count": character_count,
             "metadata": metadata,
             "file_id": file_id,
             "text_processing_completed": True,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now,
         }
 
     except Exception as e:
@@ -837,40 +1452,48 @@ async def execute_text_extractor_step(
         raise Exception(f"Text chunking failed: {str(e)}")
 
 
-def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
-    """Split text into overlapping chunks"""
-    if len(text) <= chunk_size:
-        return [text]
+SENTENCE_END_RE = re.compile(r"[.!?\n]")
+
+
+def iter_chunks(text: str, chunk_size: int = 1000, overlap: int = 200) -> Iterator[str]:
+    """Split text into overlapping chunks, yielding them one at a time"""
+    if overlap >= chunk_size:
+        raise ValueError(
+            f"Chunk overlap ({overlap}) must be smaller than chunk size ({chunk_size})"
+        )
+
+    text_length = len(text)
+    if text_length <= chunk_size:
+        chunk = text.strip()
+        if chunk:
+            yield chunk
+        return
 
-    chunks = []
     start = 0
 
-    while start < len(text):
+    while start < text_length:
         end = start + chunk_size
 
         # Try to break at sentence boundary
-        if end < len(text):
-            # Look for sentence endings
-            sentence_ends = [".", "!", "?", "\n"]
-            best_break = end
-
-            for i in range(end - 100, end + 100):
-                if i < len(text) and text[i] in sentence_ends:
-                    best_break = i + 1
-                    break
-
-            end = best_break
+        if end < text_length:
+            # Look for the first sentence ending around the chunk end. Breaks
+            # must leave the chunk longer than the overlap, or the next chunk
+            # would not start after this one.
+            sentence_end = SENTENCE_END_RE.search(
+                text, max(start + overlap + 1, end - 100), min(text_length, end + 100)
+            )
+            if sentence_end:
+                end = sentence_end.start() + 1
 
         chunk = text[start:end].strip()
         if chunk:
-            chunks.append(chunk)
-
-        start = end - overlap
+            yield chunk
 
-        if start >= len(text):
+        # The rest of the text would only repeat the overlap
+        if end >= text_length:
             break
 
-    return chunks
+        start = end - overlap
 
 
 async def execute_llm_entity_extractor_step(
@@ -895,65 +1518,76 @@ async def execute_llm_entity_extractor_step(
     text_chunks = input_data["text_chunks"]
     file_id = input_data.get("file_id")
 
-    all_entities: List[Dict[str, Any]] = []
-    all_relationships: List[Dict[str, Any]] = []
-
-    try:
-        # Process each text chunk
-        for i, chunk in enumerate(text_chunks):
-            logger.info(f"Processing chunk {i+1}/{len(text_chunks)}")
-
-            # Prepare prompt
-            prompt = (
-                prompt_template.format(text=chunk)
-                if prompt_template
-                else f"""
-                        Extract entities and relationships from the following text.
-
-                        Entity types: {', '.join(entity_types)}
-                        Relationship types: {', '.join(relationship_types)}
+    prompts = []
+    processed_text_length = 0
+    for chunk in text_chunks:
+        prompts.append(
+            build_extraction_prompt(
+                chunk, prompt_template, entity_types, relationship_types
+            )
+        )
+        processed_text_length += len(chunk)
 
-                        Text: {chunk}
+    max_concurrency = config.get("max_concurrency", 8)
+    semaphore = asyncio.Semaphore(max_concurrency)
 
-                        Return a JSON object with:
-                        1. entities: list of {{text, type, confidence}}
-                        2. relationships: list of {{source, target, type, confidence}}
-                    """
-            )
+    async def extract_chunk(i: int, prompt: str) -> Dict[str, Any]:
+        """Extract one chunk, with at most max_concurrency calls in flight"""
+        async with semaphore:
+            logger.info(f"Processing chunk {i+1}/{len(text_chunks)}")
 
             # Call OpenAI API
             try:
                 response = await call_openai_api(prompt, model, max_tokens, temperature)
-                result = parse_llm_response(response)
+                return parse_llm_response(response)
+            except Exception as e:
+                logger.warning(f"Failed to process chunk {i+1}: {str(e)}")
+                return {"entities": [], "relationships": []}
 
-                if result.get("entities"):
-                    all_entities.append(
-                        {"chunk_index": i, "entities": result["entities"]}
-                    )
+    all_entities: List[Dict[str, Any]] = []
+    all_relationships: List[Dict[str, Any]] = []
 
-                if result.get("relationships") and extract_relationships:
-                    all_relationships.append(
-                        {"chunk_index": i, "relationships": result["relationships"]}
-                    )
+    try:
+        if config.get("batch_mode") and len(prompts) >= config.get(
+            "batch_min_chunks", 50
+        ):
+            # Offline extraction: trade latency for the cheaper Batch API
+            responses = await call_openai_batch(prompts, model, max_tokens, temperature)
+            results = [
+                (
+                    parse_llm_response(response)
+                    if response is not None
+                    else {"entities": [], "relationships": []}
+                )
+                for response in responses
+            ]
+        else:
+            # Process the text chunks concurrently; results keep the chunk order
+            results = await asyncio.gather(
+                *[extract_chunk(i, prompt) for i, prompt in enumerate(prompts)]
+            )
 
-            except Exception as e:
-                logger.warning(f"Failed to process chunk {i+1}: {str(e)}")
-                continue
+        for i, result in enumerate(results):
+            if result.get("entities"):
+                all_entities.append({"chunk_index": i, "entities": result["entities"]})
+
+            if result.get("relationships") and extract_relationships:
+                all_relationships.append(
+                    {"chunk_index": i, "relationships": result["relationships"]}
+                )
 
         # Deduplicate entities
         unique_entities = deduplicate_entities(all_entities)
         unique_relationships = deduplicate_relationships(all_relationships)
 
         # Save results to extraction_results table (matches schema)
-        from app.core.supabase import get_supabase
-
         supabase = await get_supabase()
 
         extraction_record = {
             "source_id": file_id,
             "entity_count": len(unique_entities),
             "relationship_count": len(unique_relationships),
-            "processed_text_length": sum(len(chunk) for chunk in text_chunks),
+            "processed_text_length": processed_text_length,
             "extracted_entities": unique_entities,
             "extracted_relationships": unique_relationships,
             "status": "completed",
@@ -975,12 +1609,42 @@ async def execute_llm_entity_extractor_step(
             "relationship_count": len(unique_relationships),
             "chunks_processed": len(text_chunks),
             "model_used": model,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utcnow_iso(),
         }
 
-    except Exception as e:
-        logger.error(f"Entity extraction failed: {str(e)}")
-        raise Exception(f"Entity extraction failed: {str(e)}")
+    except Exception as e:
+        logger.error(f"Entity extraction failed: {str(e)}")
+        raise Exception(f"Entity extraction failed: {str(e)}")
+
+
+EXTRACTION_SYSTEM_PROMPT = (
+    "You are an expert at extracting entities and relationships from text. "
+    "Always return valid JSON."
+)
+
+
+def build_extraction_prompt(
+    chunk: str,
+    prompt_template: str,
+    entity_types: List[str],
+    relationship_types: List[str],
+) -> str:
+    """Build the entity extraction prompt of a text chunk"""
+    if prompt_template:
+        return prompt_template.format(text=chunk)
+
+    return f"""
+                        Extract entities and relationships from the following text.
+
+                        Entity types: {', '.join(entity_types)}
+                        Relationship types: {', '.join(relationship_types)}
+
+                        Text: {chunk}
+
+                        Return a JSON object with:
+                        1. entities: list of {{text, type, confidence}}
+                        2. relationships: list of {{source, target, type, confidence}}
+                    """
 
 
 async def call_openai_api(
@@ -988,18 +1652,12 @@ async def call_openai_api(
 ) -> str:
     """Call OpenAI API for entity extraction"""
     try:
-        # You'll need to set up OpenAI client
-        from openai import AsyncOpenAI
-
         client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
         response = await client.chat.completions.create(
             model=model,
             messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert at extracting entities and relationships from text. Always return valid JSON.",
-                },
+                {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
             max_tokens=max_tokens,
@@ -1016,19 +1674,111 @@ async def call_openai_api(
         raise Exception(f"OpenAI API call failed: {str(e)}")
 
 
+async def call_openai_batch(
+    prompts: List[str],
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    poll_interval: float = 10.0,
+    max_poll_interval: float = 300.0,
+) -> List[Optional[str]]:
+    """
+    Run entity extraction prompts through the OpenAI Batch API.
+
+    Args:
+        prompts: Prompts to complete
+        model: Completion model
+        max_tokens: Maximum tokens per completion
+        temperature: Sampling temperature
+        poll_interval: Initial delay between status checks, doubled after each
+        max_poll_interval: Upper bound of the delay between status checks
+
+    Returns:
+        Completion of each prompt, in order; None where its request failed
+    """
+    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+
+    requests = [
+        serialization.dumps(
+            {
+                "custom_id": f"chunk-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt},
+                    ],
+                    "max_tokens": max_tokens,
+                    "temperature": temperature,
+                },
+            }
+        )
+        for i, prompt in enumerate(prompts)
+    ]
+
+    try:
+        batch_file = await client.files.create(
+            file=("entity_extraction.jsonl", "\n".join(requests).encode()),
+            purpose="batch",
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} with {len(prompts)} prompts")
+
+        delay = poll_interval
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise Exception(f"Batch {batch.id} ended with status {batch.status}")
+
+        completions: List[Optional[str]] = [None] * len(prompts)
+        if not batch.output_file_id:
+            return completions
+
+        output = await client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line:
+                continue
+            item = serialization.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            index = int(item["custom_id"].split("-", 1)[1])
+            completions[index] = response["body"]["choices"][0]["message"]["content"]
+
+        return completions
+
+    except Exception as e:
+        raise Exception(f"OpenAI batch call failed: {str(e)}")
+
+
+JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
 def parse_llm_response(response: str) -> Dict[str, Any]:
     """Parse LLM response to extract entities and relationships"""
+    # Completions without content come back as None
+    if not isinstance(response, str):
+        return {"entities": [], "relationships": []}
+
     try:
         # Try to parse as JSON
-        result = json.loads(response)
-        return result
-    except json.JSONDecodeError:
+        return serialization.loads(response)
+    except ValueError:
         # Fallback: try to extract JSON from response
-        json_match = re.search(r"\{.*\}", response, re.DOTALL)
+        json_match = JSON_OBJECT_RE.search(response)
         if json_match:
             try:
-                return json.loads(json_match.group())
-            except:
+                return serialization.loads(json_match.group())
+            except ValueError:
                 pass
 
         # Ultimate fallback: return empty result
@@ -1038,47 +1788,41 @@ def parse_llm_response(response: str) -> Dict[str, Any]:
 def deduplicate_entities(
     extraction_entities: List[Dict[str, Any]],
 ) -> List[Dict[str, Any]]:
-    """Remove duplicate entities"""
-    seen = set()
-    unique_entities = []
+    """Remove duplicate entities, keeping the first of each text and type"""
+    unique_entities: Dict[Tuple[str, str], Dict[str, Any]] = {}
 
     for extraction_item in extraction_entities:
-        entities = extraction_item.get("entities", [])
-        for entity in entities:
+        chunk_index = extraction_item.get("chunk_index", 0)
+        for entity in extraction_item.get("entities", []):
             key = (entity.get("text", "").lower(), entity.get("type", ""))
-            if key not in seen:
-                seen.add(key)
+            if unique_entities.setdefault(key, entity) is entity:
                 # Add unique ID
                 entity["id"] = str(uuid4())
-                entity["chunk_index"] = extraction_item.get("chunk_index", 0)
-                unique_entities.append(entity)
+                entity["chunk_index"] = chunk_index
 
-    return unique_entities
+    return list(unique_entities.values())
 
 
 def deduplicate_relationships(
     extraction_relationships: List[Dict[str, Any]],
 ) -> List[Dict[str, Any]]:
-    """Remove duplicate relationships"""
-    seen = set()
-    unique_relationships = []
+    """Remove duplicate relationships, keeping the first of each kind"""
+    unique_relationships: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
 
     for extraction_item in extraction_relationships:
-        relationships = extraction_item.get("relationships", [])
-        for rel in relationships:
+        chunk_index = extraction_item.get("chunk_index", 0)
+        for rel in extraction_item.get("relationships", []):
             key = (
                 rel.get("source", "").lower(),
                 rel.get("target", "").lower(),
                 rel.get("type", ""),
             )
-            if key not in seen:
-                seen.add(key)
+            if unique_relationships.setdefault(key, rel) is rel:
                 # Add unique ID
                 rel["id"] = str(uuid4())
-                rel["chunk_index"] = extraction_item.get("chunk_index", 0)
-                unique_relationships.append(rel)
+                rel["chunk_index"] = chunk_index
 
-    return unique_relationships
+    return list(unique_relationships.values())
 
 
 async def execute_entity_resolution_step(
@@ -1105,8 +1849,6 @@ async def execute_entity_resolution_step(
         )
 
         # Update existing extraction_results record
-        from app.core.supabase import get_supabase
-
         supabase = await get_supabase()
 
         # Update the extraction record with resolved data
@@ -1128,7 +1870,7 @@ async def execute_entity_resolution_step(
             "duplicates_merged": len(entities) - len(resolved_entities),
             "resolution_strategy": resolution_strategy,
             "similarity_threshold": similarity_threshold,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utcnow_iso(),
         }
 
     except Exception as e:
@@ -1166,11 +1908,100 @@ def resolve_exact_match(entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return list(entity_map.values())
 
 
+# Entity types with at least this many entities are blocked with MinHash LSH
+# instead of comparing every pair
+LSH_MIN_BUCKET_SIZE = 64
+LSH_NUM_PERM = 64
+
+
+def text_shingles(text: str, size: int = 2) -> Set[str]:
+    """Character n-grams of a text, or the text itself when it is shorter"""
+    if len(text) <= size:
+        return {text}
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def fuzzy_match_candidates(
+    entities: List[Dict[str, Any]], texts: List[str], threshold: float
+) -> List[List[int]]:
+    """
+    Find, for each entity, the later entities of the same type that may be
+    similar enough to merge with it.
+
+    Large type buckets are indexed with MinHash LSH over character bigrams
+    when datasketch is installed. The LSH threshold is kept well below the
+    similarity threshold so that it only prunes clearly different pairs.
+
+    Args:
+        entities: Entities to resolve
+        texts: Lowercased text of each entity
+        threshold: Similarity threshold
+
+    Returns:
+        Sorted candidate indices of each entity
+    """
+    buckets: Dict[Any, List[int]] = defaultdict(list)
+    for i, entity in enumerate(entities):
+        buckets[entity.get("type")].append(i)
+
+    candidates: List[List[int]] = [[] for _ in entities]
+
+    for bucket in buckets.values():
+        if not DATASKETCH_AVAILABLE or len(bucket) < LSH_MIN_BUCKET_SIZE:
+            for position, i in enumerate(bucket):
+                candidates[i] = bucket[position + 1 :]
+            continue
+
+        lsh = MinHashLSH(
+            threshold=threshold / 2, num_perm=LSH_NUM_PERM, weights=(0.2, 0.8)
+        )
+        signatures = {}
+        for i in bucket:
+            signature = MinHash(num_perm=LSH_NUM_PERM)
+            signature.update_batch(
+                [shingle.encode() for shingle in text_shingles(texts[i])]
+            )
+            lsh.insert(i, signature)
+            signatures[i] = signature
+
+        for i in bucket:
+            candidates[i] = sorted(j for j in lsh.query(signatures[i]) if j > i)
+
+    return candidates
+
+
+@lru_cache(maxsize=4096)
+def _text_similarity(a: str, b: str, cutoff: float) -> float:
+    if RAPIDFUZZ_AVAILABLE:
+        return fuzz.ratio(a, b, score_cutoff=cutoff * 100) / 100
+
+    matcher = SequenceMatcher(None, a, b)
+    if cutoff and matcher.quick_ratio() < cutoff:
+        return 0.0
+    return matcher.ratio()
+
+
+def text_similarity(a: str, b: str, cutoff: float = 0.0) -> float:
+    """
+    Similarity ratio of two strings, computed by rapidfuzz when it is
+    installed and by difflib otherwise. Scores are cached, with the pair in a
+    fixed order so that both comparison directions share an entry.
+
+    With a cutoff, pairs found to be below it early score 0.0 without
+    computing the full ratio.
+    """
+    if a > b:
+        a, b = b, a
+    return _text_similarity(a, b, cutoff)
+
+
 def resolve_fuzzy_match(
     entities: List[Dict[str, Any]], threshold: float
 ) -> List[Dict[str, Any]]:
     """Resolve entities using fuzzy string matching"""
-    from difflib import SequenceMatcher
+    texts = [entity.get("text", "").lower() for entity in entities]
+    lengths = [len(text) for text in texts]
+    candidates = fuzzy_match_candidates(entities, texts, threshold)
 
     resolved = []
     processed = set()
@@ -1182,18 +2013,21 @@ def resolve_fuzzy_match(
         merged_entity = entity.copy()
         similar_indices = [i]
 
-        for j, other in enumerate(entities[i + 1 :], i + 1):
+        # Only compare entities of same type
+        for j in candidates[i]:
             if j in processed:
                 continue
 
-            # Only compare entities of same type
-            if entity.get("type") != other.get("type"):
+            # The ratio is at most 2 * min / (sum) of the two lengths, so
+            # pairs of very different lengths can never reach the threshold
+            shorter, longer = sorted((lengths[i], lengths[j]))
+            if 2 * shorter < threshold * (shorter + longer):
                 continue
 
+            other = entities[j]
+
             # Calculate similarity
-            similarity = SequenceMatcher(
-                None, entity.get("text", "").lower(), other.get("text", "").lower()
-            ).ratio()
+            similarity = text_similarity(texts[i], texts[j], cutoff=threshold)
 
             if similarity >= threshold:
                 similar_indices.append(j)
@@ -1208,6 +2042,11 @@ def resolve_fuzzy_match(
     return resolved
 
 
+def normalize_entity_text(text: str) -> str:
+    """Key under which entity texts and relationship endpoints are matched"""
+    return text.strip().lower()
+
+
 async def execute_knowledge_graph_writer_step(
     config: Dict[str, Any], input_data: Optional[Dict[str, Any]]
 ) -> Dict[str, Any]:
@@ -1244,134 +2083,128 @@ async def execute_knowledge_graph_writer_step(
     resolved_relationships = mapped_relationships + unmapped_relationships
 
     extraction_id = input_data.get("extraction_id")
+    embedding: Optional[asyncio.Task] = None
+    entity_sync: Optional[asyncio.Task] = None
 
     try:
-        from app.core.supabase import get_supabase
-
-        supabase = await get_supabase()
-
-        entities_created = 0
-        relationships_created = 0
         created_relationships = []
-        created_entities = []
-        entity_id_map = {}  # Map entity text to UUID for relationships
-        entity_text_map = {}
-        entities = []
-
-        # Create entities in batches
-        for i in range(0, len(resolved_entities), batch_size):
-            batch = resolved_entities[i : i + batch_size]
-            entity_records = []
-
-            for entity in batch:
-                entity_record = {
-                    "entity_text": entity.get("text", ""),
-                    "entity_type": entity.get("type", ""),
-                    "confidence": entity.get("confidence", 0.5),
-                    "fibo_class_id": (
-                        entity["fibo_mapping"]["fibo_class_id"]
-                        if entity["mapped"]
-                        else None
-                    ),
-                    "properties": {
-                        "source_extraction_id": extraction_id,
-                        "mapped": entity["mapped"] if "mapped" in entity else True,
-                        "chunk_index": entity.get("chunk_index", 0),
-                        "unmapped_reason": entity.get("unmapped_reason", ""),
-                    },
-                    "is_verified": False,
-                }
-                entity_records.append(entity_record)
 
-            # Insert batch
-            result = (
-                await supabase.table("kg_entities").insert(entity_records).execute()
-            )
-
-            # Map entity text to UUID for relationships
-            for i, record in enumerate(result.data):
-                entity_text = batch[i].get("text", "")
-                entity_id_map[entity_text] = record["id"]
-                entity_text_map[record["id"]] = entity_text
-                entities_created += 1
-                entities.append(record["id"])
-
-            created_entities.extend(result.data)
+        # Create entities
+        entity_records = [
+            {
+                "entity_text": entity.get("text", ""),
+                "entity_type": entity.get("type", ""),
+                "confidence": entity.get("confidence", 0.5),
+                "fibo_class_id": (
+                    entity["fibo_mapping"]["fibo_class_id"]
+                    if entity["mapped"]
+                    else None
+                ),
+                "properties": {
+                    "source_extraction_id": extraction_id,
+                    "mapped": entity["mapped"] if "mapped" in entity else True,
+                    "chunk_index": entity.get("chunk_index", 0),
+                    "unmapped_reason": entity.get("unmapped_reason", ""),
+                },
+                "is_verified": False,
+            }
+            for entity in resolved_entities
+        ]
+        created_entities = await insert_records(
+            "kg_entities", entity_records, batch_size
+        )
+        entities = [record["id"] for record in created_entities]
+        entities_created = len(entities)
+
+        # Map entity text to UUID for relationships. Relationship endpoints
+        # are matched on normalized text, so they still resolve when the LLM
+        # spells them with different case or surrounding whitespace.
+        entity_texts = [entity.get("text", "") for entity in resolved_entities]
+        entity_id_map = {
+            normalize_entity_text(text): entity_id
+            for text, entity_id in zip(entity_texts, entities)
+        }
+        entity_text_map = dict(zip(entities, entity_texts))
 
-        await enrich_entities_with_embeddings(
-            entity_ids=entities, batch_size=batch_size
+        # Embeddings only touch the entity rows, so they are computed while
+        # the relationships are inserted and synced
+        embedding = asyncio.create_task(
+            enrich_entities_with_embeddings(entity_ids=entities, batch_size=batch_size)
         )
 
-        # Create relationships in batches
-        for i in range(0, len(resolved_relationships), batch_size):
-            batch = resolved_relationships[i : i + batch_size]
-            relationship_records = []
-
-            for rel in batch:
-                source_text = rel.get("source", "")
-                target_text = rel.get("target", "")
-
-                # Find entity IDs
-                source_id = entity_id_map.get(source_text)
-                target_id = entity_id_map.get(target_text)
-
-                if source_id and target_id:
-                    relationship_record = {
-                        "source_entity_id": source_id,
-                        "target_entity_id": target_id,
-                        "relationship_type": rel.get("type", "RELATED_TO"),
-                        "confidence": rel.get("confidence", 0.5),
-                        "fibo_property_id": (
-                            rel["fibo_mapping"]["fibo_property_id"]
-                            if rel["mapped"]
-                            else None
-                        ),
-                        "properties": {
-                            "source_extraction_id": extraction_id,
-                            "mapped": rel["mapped"] if "mapped" in rel else True,
-                            "chunk_index": rel.get("chunk_index", 0),
-                            "unmapped_reason": rel.get("unmapped_reason", ""),
-                        },
-                        "is_verified": False,
-                    }
-                    relationship_records.append(relationship_record)
+        # Optionally sync to Neo4j (if configured). Entity nodes are written
+        # while the relationships are inserted below; the edges need both
+        # their endpoint nodes and the relationship ids, so they come last.
+        if config.get("sync_to_neo4j", True):
+            entity_sync = asyncio.create_task(sync_entity_nodes(created_entities))
 
-            if relationship_records:
-                response = (
-                    await supabase.table("kg_relationships")
-                    .insert(relationship_records)
-                    .execute()
+        # Create relationships
+        relationship_records = [
+            {
+                "source_entity_id": source_id,
+                "target_entity_id": target_id,
+                "relationship_type": rel.get("type", "RELATED_TO"),
+                "confidence": rel.get("confidence", 0.5),
+                "fibo_property_id": (
+                    rel["fibo_mapping"]["fibo_property_id"] if rel["mapped"] else None
+                ),
+                "properties": {
+                    "source_extraction_id": extraction_id,
+                    "mapped": rel["mapped"] if "mapped" in rel else True,
+                    "chunk_index": rel.get("chunk_index", 0),
+                    "unmapped_reason": rel.get("unmapped_reason", ""),
+                },
+                "is_verified": False,
+            }
+            for rel in resolved_relationships
+            # Find entity IDs
+            if (
+                source_id := entity_id_map.get(
+                    normalize_entity_text(rel.get("source", ""))
                 )
-                relationships_created += len(relationship_records)
-
-                for record in response.data:
-                    source_text = entity_text_map.get(record["source_entity_id"], "")
-                    target_text = entity_text_map.get(record["target_entity_id"], "")
-                    created_relationships.append(
-                        {
-                            "source": source_text,
-                            "target": target_text,
-                            "type": record["relationship_type"],
-                            "confidence": record["confidence"],
-                            "id": record["id"],
-                            "properties": record["properties"],
-                        }
-                    )
+            )
+            and (
+                target_id := entity_id_map.get(
+                    normalize_entity_text(rel.get("target", ""))
+                )
+            )
+        ]
+
+        inserted_relationships = await insert_records(
+            "kg_relationships", relationship_records, batch_size
+        )
+        relationships_created = len(inserted_relationships)
+
+        for record in inserted_relationships:
+            source_text = entity_text_map.get(record["source_entity_id"], "")
+            target_text = entity_text_map.get(record["target_entity_id"], "")
+            created_relationships.append(
+                {
+                    "source": source_text,
+                    "target": target_text,
+                    "type": record["relationship_type"],
+                    "confidence": record["confidence"],
+                    "id": record["id"],
+                    "properties": record["properties"],
+                }
+            )
 
-        # Optionally sync to Neo4j (if configured)
         neo4j_status = "skipped"
         neo4j_results: Dict[str, Any] | None = None
-        if config.get("sync_to_neo4j", True):
+        if entity_sync is not None:
             try:
                 # Store in Neo4j with FIBO metadata
-                neo4j_results = await sync_to_neo4j(
-                    entities=created_entities, relationships=created_relationships
+                neo4j_results = await entity_sync
+                neo4j_results.update(
+                    await sync_relationship_edges(created_relationships)
                 )
                 neo4j_status = "completed"
             except Exception as e:
                 logger.warning(f"Neo4j sync failed: {str(e)}")
                 neo4j_status = "failed"
 
+        await embedding
+
         return {
             "knowledge_graph_updated": True,
             "entities_created": entities_created,
@@ -1379,84 +2212,139 @@ async def execute_knowledge_graph_writer_step(
             "batch_size": batch_size,
             "neo4j_results": neo4j_results,
             "neo4j_status": neo4j_status,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utcnow_iso(),
         }
 
     except Exception as e:
+        for task in (embedding, entity_sync):
+            if task is not None and not task.done():
+                task.cancel()
         logger.error(f"Knowledge graph writing failed: {str(e)}")
         raise Exception(f"Knowledge graph writing failed: {str(e)}")
 
 
-async def sync_to_neo4j(
-    entities: List[Dict[str, Any]], relationships: List[Dict[str, Any]]
-):
-    """Optional Neo4j sync - simplified implementation"""
-    try:
-        from app.utils.neo4j import get_neo4j_driver
+# Up to this many rows are inserted with a single request; larger inserts are
+# split into batches sent concurrently
+SINGLE_INSERT_MAX_ROWS = 1000
+
+
+async def insert_records(
+    table: str, records: List[Dict[str, Any]], batch_size: int
+) -> List[Dict[str, Any]]:
+    """
+    Insert rows into a table.
+
+    Args:
+        table: Table name
+        records: Rows to insert
+        batch_size: Rows per request when the insert has to be split
+
+    Returns:
+        Inserted rows, in the order of records
+    """
+    if not records:
+        return []
+
+    supabase = await get_supabase()
+
+    if len(records) <= SINGLE_INSERT_MAX_ROWS:
+        batches = [records]
+    else:
+        batches = [
+            records[i : i + batch_size] for i in range(0, len(records), batch_size)
+        ]
+
+    results = await asyncio.gather(
+        *[supabase.table(table).insert(batch).execute() for batch in batches]
+    )
+    return [row for result in results for row in result.data]
+
 
+async def sync_entity_nodes(entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge created entities into Neo4j as nodes, with one UNWIND query per
+    entity type since the type is the node label
+    """
+    try:
         driver = get_neo4j_driver()
 
-        logger.info(
-            f"Syncing {entities} entities and {relationships} relationships to Neo4j"
-        )
+        logger.info(f"Syncing {len(entities)} entities to Neo4j")
 
-        async with driver.session() as session:
-            # Create entities
-            for entity in entities:
-                entity_type = entity.get("entity_type", "Entity").replace(" ", "_")
-                entity_text = entity.get("entity_text", "")
-                confidence = entity.get("confidence", 0.5)
-                entity_id = entity.get("id", str(uuid4()))
+        rows_by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for entity in entities:
+            entity_type = entity.get("entity_type", "Entity").replace(" ", "_")
+            rows_by_type[entity_type].append(
+                {
+                    "text": entity.get("entity_text", ""),
+                    "entity_id": entity.get("id", str(uuid4())),
+                    "entity_type": entity_type,
+                    "confidence": entity.get("confidence", 0.5),
+                }
+            )
 
+        async with driver.session() as session:
+            for entity_type, rows in rows_by_type.items():
                 query = f"""
-                MERGE (e:`{entity_type}` {{text: $text}})
-                SET e.confidence = $confidence,
-                    e.entity_id = $entity_id,
-                    e.entity_type = $entity_type,
+                UNWIND $rows AS row
+                MERGE (e:`{entity_type}` {{text: row.text}})
+                SET e.confidence = row.confidence,
+                    e.entity_id = row.entity_id,
+                    e.entity_type = row.entity_type,
                     e.updated_at = datetime()
-                RETURN e
                 """
-                await session.run(
-                    query,
-                    {
-                        "text": entity_text,
-                        "entity_id": entity_id,
-                        "entity_type": entity_type,
-                        "confidence": confidence,
-                    },
-                )
+                await session.run(query, {"rows": rows})
+
+        return {"entities_synced": len(entities)}
+
+    except Exception as e:
+        logger.error(f"Neo4j entity sync failed: {str(e)}")
+        raise
+
+
+async def sync_relationship_edges(
+    relationships: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Merge created relationships into Neo4j as edges, with one UNWIND query per
+    relationship type. Endpoints are matched by text, so the entity nodes
+    must have been synced first.
+    """
+    try:
+        driver = get_neo4j_driver()
+
+        logger.info(f"Syncing {len(relationships)} relationships to Neo4j")
 
-            # Create relationships
-            for rel in relationships:
-                source_text = rel.get("source", "")
-                target_text = rel.get("target", "")
-                rel_type = rel.get("type", "RELATED_TO").replace(" ", "_")
-                rel_id = rel.get("id", str(uuid4()))
-                confidence = rel.get("confidence", 0.5)
+        rows_by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for rel in relationships:
+            rel_type = rel.get("type", "RELATED_TO").replace(" ", "_")
+            rows_by_type[rel_type].append(
+                {
+                    "source_text": rel.get("source", ""),
+                    "target_text": rel.get("target", ""),
+                    "rel_type": rel_type,
+                    "rel_id": rel.get("id", str(uuid4())),
+                    "confidence": rel.get("confidence", 0.5),
+                }
+            )
 
+        async with driver.session() as session:
+            for rel_type, rows in rows_by_type.items():
                 query = f"""
-                MATCH (source {{text: $source_text}})
-                MATCH (target {{text: $target_text}})
+                UNWIND $rows AS row
+                MATCH (source {{text: row.source_text}})
+                MATCH (target {{text: row.target_text}})
                 MERGE (source)-[r:`{rel_type}`]->(target)
-                SET r.confidence = $confidence,
-                    r.relationship_id = $rel_id,
-                    r.relationship_type = $rel_type,
+                SET r.confidence = row.confidence,
+                    r.relationship_id = row.rel_id,
+                    r.relationship_type = row.rel_type,
                     r.updated_at = datetime()
-                RETURN r
                 """
-                await session.run(
-                    query,
-                    {
-                        "source_text": source_text,
-                        "target_text": target_text,
-                        "rel_type": rel_type,
-                        "rel_id": rel_id,
-                        "confidence": confidence,
-                    },
-                )
+                await session.run(query, {"rows": rows})
+
+        return {"relationships_synced": len(relationships)}
 
     except Exception as e:
-        logger.error(f"Neo4j sync failed: {str(e)}")
+        logger.error(f"Neo4j relationship sync failed: {str(e)}")
         raise
 
 
@@ -1464,9 +2352,6 @@ async def execute_custom_python_step(
     config: Dict[str, Any], input_data: Optional[Dict[str, Any]]
 ) -> Dict[str, Any]:
     """Execute custom Python code step - Simplified"""
-    import subprocess
-    import tempfile
-
     code = config.get("code")
     if not code:
         raise ValueError("code is required for custom Python step")
@@ -1481,44 +2366,82 @@ async def execute_custom_python_step(
             if source_key in input_data:
                 mapped_inputs[key] = input_data[source_key]
 
-    # Create temporary script file
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-        f.write(f"import json\n")
-        f.write(f"input_data = {json.dumps(mapped_inputs)}\n\n")
-        f.write(code)
-        f.write(f"\n\n# Output result as JSON\n")
-        f.write(f"if 'result' in locals():\n")
-        f.write(f"    print(json.dumps(result))\n")
-        f.write(f"else:\n")
-        f.write(f"    print(json.dumps({{}}))\n")
-        script_path = f.name
+    # Custom code runs in its own interpreter, which is killed on timeout and
+    # cannot reach the worker's credentials or globals. Only deployments that
+    # trust all pipeline authors may skip the interpreter start-up and run it
+    # in the worker; a timeout there stops waiting for the code but cannot
+    # stop the code.
+    if not settings.CUSTOM_PYTHON_IN_PROCESS or config.get("requirements"):
+        output = await run_custom_python_subprocess(code, mapped_inputs, timeout)
+    else:
+        try:
+            output = await asyncio.wait_for(
+                asyncio.to_thread(exec_custom_python, code, mapped_inputs),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            raise Exception(f"Script execution timed out after {timeout} seconds")
 
-    try:
-        # Execute the script
-        result = subprocess.run(
-            ["python", script_path], capture_output=True, text=True, timeout=timeout
-        )
+    return {
+        "custom_python_executed": True,
+        "result": output,
+        "execution_time": timeout,
+        "timestamp": utcnow_iso(),
+    }
 
-        if result.returncode != 0:
-            raise Exception(f"Script execution failed: {result.stderr}")
 
-        # Parse output
-        try:
-            output = json.loads(result.stdout.strip())
-        except json.JSONDecodeError:
-            output = {"raw_output": result.stdout}
+@lru_cache(maxsize=256)
+def compile_custom_python(code: str) -> CodeType:
+    """Compile custom step code once per distinct snippet"""
+    return compile(code, "<custom_python_step>", "exec")
 
-        return {
-            "custom_python_executed": True,
-            "result": output,
-            "execution_time": timeout,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
 
-    finally:
-        # Clean up temporary file
-        if os.path.exists(script_path):
-            os.unlink(script_path)
+def exec_custom_python(code: str, mapped_inputs: Dict[str, Any]) -> Any:
+    """Run custom code in a fresh namespace and return its `result` variable"""
+    namespace = {"input_data": mapped_inputs, "json": json}
+
+    try:
+        exec(compile_custom_python(code), namespace)
+    except Exception as e:
+        raise Exception(f"Script execution failed: {type(e).__name__}: {str(e)}")
+
+    return namespace.get("result", {})
+
+
+async def run_custom_python_subprocess(
+    code: str, mapped_inputs: Dict[str, Any], timeout: int
+) -> Any:
+    """Run custom code in a separate Python interpreter"""
+    # The script is fed through stdin, so no temporary file is needed
+    script = (
+        "import json\n"
+        f"input_data = json.loads({serialization.dumps(mapped_inputs)!r})\n\n"
+        f"{code}"
+        "\n\n# Output result as JSON\n"
+        "if 'result' in locals():\n"
+        "    print(json.dumps(result))\n"
+        "else:\n"
+        "    print(json.dumps({}))\n"
+    )
+
+    # Execute the script without blocking the event loop
+    result = await asyncio.to_thread(
+        subprocess.run,
+        [sys.executable, "-"],
+        input=script,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+
+    if result.returncode != 0:
+        raise Exception(f"Script execution failed: {result.stderr}")
+
+    # Parse output
+    try:
+        return serialization.loads(result.stdout.strip())
+    except json.JSONDecodeError:
+        return {"raw_output": result.stdout}
 
 
 # =============================================
@@ -1530,16 +2453,14 @@ async def execute_file_reader_step(
     config: Dict[str, Any], input_data: Optional[Dict[str, Any]]
 ) -> Dict[str, Any]:
     """Execute file reader step with data source resolution"""
-    from app.services.file_upload import UploadService
-    from app.utils.file_handler import process_file
-
-    file_upload_service = UploadService()
+    file_upload_service = get_upload_service()
 
-    # Resolve data source configuration
-    resolved_config = await resolve_datasource_config(config)
+    # Resolve data source configuration, unless the file is set explicitly
+    resolved_config = await resolve_datasource_config(config, fields=("file_id",))
 
     # Get file ID from config or input data or data source
     file_id = None
+    file_info = None
 
     # Priority: explicit file_id > input data > data source latest file
     if "file_id" in resolved_config:
@@ -1548,32 +2469,35 @@ async def execute_file_reader_step(
         file_id = input_data["file_id"]
 
     if not file_id and "datasource_id" in resolved_config:
-        # Get latest file from data source
-        file_id = await get_latest_file_from_datasource(
+        # Get latest file from data source, with the metadata read below
+        file_info = await get_latest_file_from_datasource(
             resolved_config["datasource_id"]
         )
+        if file_info:
+            file_id = file_info["id"]
 
     if not file_id:
         raise ValueError("No file available to read")
 
-    file_info = await file_upload_service.get_file_upload(file_id)
-    file_response = await file_upload_service.get_file_content(file_id)
-
-    if not file_response:
-        raise ValueError(f"File {file_id} not found or inaccessible")
+    if file_info is None:
+        file_info = await file_upload_service.get_file_upload(file_id)
 
-    # Save to local to process
-    local_file_path = f"/tmp/{file_id}-{file_info['file_name']}"
-
-    with open(local_file_path, "wb") as f:
-        f.write(file_response)
+    # Stream the file into a spooled buffer that stays in memory for small
+    # files and spills to disk for large ones, writing off the event loop
+    with tempfile.SpooledTemporaryFile(max_size=settings.FILE_SPOOL_MAX_SIZE) as f:
+        bytes_written = 0
+        async for chunk in file_upload_service.get_file_content_stream(
+            file_id, file_upload=file_info
+        ):
+            bytes_written += await asyncio.to_thread(f.write, chunk)
 
-    # Process file content based on format
-    file_content = await process_file(local_file_path, file_info["file_type"])
+        if not bytes_written:
+            raise ValueError(f"File {file_id} not found or inaccessible")
 
-    # Clean up
-    if os.path.exists(local_file_path):
-        os.unlink(local_file_path)
+        # Process file content based on format
+        file_content = await process_file(
+            f, file_info["file_type"], file_name=file_info["file_name"]
+        )
 
     return {
         "file_processed": True,
@@ -1581,7 +2505,7 @@ async def execute_file_reader_step(
         "file_content": file_content,  # Pass content to next step
         "datasource_info": resolved_config.get("_datasource_info"),
         "processing_status": "completed",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utcnow_iso(),
     }
 
 
@@ -1590,15 +2514,15 @@ async def execute_api_fetcher_step(
 ) -> Dict[str, Any]:
     """Execute API fetcher step with data source resolution"""
     # Resolve data source configuration
-    resolved_config = await resolve_datasource_config(config)
+    resolved_config = await resolve_datasource_config(
+        config, fields=("url", "headers", "auth_config")
+    )
 
     # Required fields after resolution
     if "url" not in resolved_config:
         raise ValueError("URL is required for API fetcher step")
 
     # Use resolved config for API call
-    from app.tasks.ingestion import ingest_api_data
-
     result = await ingest_api_data(
         api_url=resolved_config["url"],
         data_format=resolved_config.get("data_format", "json"),
@@ -1618,7 +2542,7 @@ async def execute_api_fetcher_step(
         "api_url": resolved_config["url"],
         "datasource_info": resolved_config.get("_datasource_info"),
         "data_format": resolved_config.get("data_format", "json"),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utcnow_iso(),
     }
 
 
@@ -1627,7 +2551,9 @@ async def execute_database_extractor_step(
 ) -> Dict[str, Any]:
     """Execute database extractor step with data source resolution"""
     # Resolve data source configuration
-    resolved_config = await resolve_datasource_config(config)
+    resolved_config = await resolve_datasource_config(
+        config, fields=("connection_string",)
+    )
 
     # Required fields after resolution
     required_fields = ["connection_string", "query"]
@@ -1635,8 +2561,6 @@ async def execute_database_extractor_step(
         if field not in resolved_config:
             raise ValueError(f"{field} is required for database extractor step")
 
-    from app.tasks.ingestion import ingest_database_data
-
     result = await ingest_database_data(
         connection_string=resolved_config["connection_string"],
         query=resolved_config["query"],
@@ -1645,7 +2569,7 @@ async def execute_database_extractor_step(
             if resolved_config.get("datasource_id")
             else None
         ),
-        output_format=resolved_config.get("output_format", "csv"),
+        output_format=resolved_config.get("output_format", "parquet"),
     )
 
     return {
@@ -1653,29 +2577,99 @@ async def execute_database_extractor_step(
         "file_id": result.get("id") if result else None,
         "query": resolved_config["query"],
         "datasource_info": resolved_config.get("_datasource_info"),
-        "output_format": resolved_config.get("output_format", "csv"),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "output_format": resolved_config.get("output_format", "parquet"),
+        "timestamp": utcnow_iso(),
     }
 
 
-async def resolve_datasource_config(config: Dict[str, Any]) -> Dict[str, Any]:
-    """Resolve data source configuration for step execution"""
+# Datasource lookups shared by the steps resolving the same datasource.
+# Datasources and their credentials rarely change, so lookups are reused for
+# a while. Entries are (started_at, lookup).
+DATASOURCE_CACHE_TTL = 60.0
+_datasource_lookups: Dict[str, Tuple[float, asyncio.Future]] = {}
+
+
+async def fetch_datasource_with_credentials(
+    datasource_id: str,
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Load a datasource and its credentials"""
+    datasource_service = get_datasource_service()
+
+    # The credentials do not depend on the datasource row; fetch both at once
+    datasource, credentials = await asyncio.gather(
+        datasource_service.get_datasource(datasource_id),
+        datasource_service.get_data_source_credentials(datasource_id),
+    )
+
+    return datasource, credentials
+
+
+async def get_datasource_with_credentials(
+    datasource_id: str,
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Get a datasource and its credentials. Concurrent callers share one
+    lookup, and its result is reused for DATASOURCE_CACHE_TTL seconds.
+
+    Args:
+        datasource_id: Datasource ID
+
+    Returns:
+        Datasource and its credentials
+    """
+    now = time.monotonic()
+    entry = _datasource_lookups.get(datasource_id)
+    if entry is None or now - entry[0] >= DATASOURCE_CACHE_TTL:
+        lookup = asyncio.ensure_future(fetch_datasource_with_credentials(datasource_id))
+        _datasource_lookups[datasource_id] = (now, lookup)
+    else:
+        lookup = entry[1]
+
+    try:
+        # Shielded so that a cancelled caller does not cancel the others
+        return await asyncio.shield(lookup)
+    except Exception:
+        # Failed lookups are not reused
+        if _datasource_lookups.get(datasource_id, (0.0, None))[1] is lookup:
+            del _datasource_lookups[datasource_id]
+        raise
+
+
+async def prefetch_datasource(datasource_id: str) -> None:
+    """Warm the datasource lookup cache ahead of the steps that need it"""
+    try:
+        await get_datasource_with_credentials(datasource_id)
+    except Exception as e:
+        # The step resolving the datasource looks it up again and reports it
+        logger.warning(f"Failed to prefetch datasource {datasource_id}: {str(e)}")
+
+
+async def resolve_datasource_config(
+    config: Dict[str, Any], fields: Tuple[str, ...] = ()
+) -> Dict[str, Any]:
+    """
+    Resolve data source configuration for step execution
+
+    Args:
+        config: Step config
+        fields: Config keys the step takes from its datasource. When the
+            config already sets all of them, the datasource is not looked up.
+
+    Returns:
+        Step config completed from the datasource
+    """
     datasource_id = config.get("datasource_id")
     if not datasource_id:
         return config
 
-    from app.services.datasource import DataSourceService
-
-    datasource_service = DataSourceService()
+    if fields and all(field in config for field in fields):
+        return config
 
     try:
-        datasource = await datasource_service.get_datasource(datasource_id)
-        connection_details = datasource["connection_details"]
-
-        # Get credentials if needed
-        credentials = await datasource_service.get_data_source_credentials(
+        datasource, credentials = await get_datasource_with_credentials(
             datasource_id
         )
+        connection_details = datasource["connection_details"]
 
         # Merge datasource config into step config
         resolved_config = config.copy()
@@ -1713,15 +2707,15 @@ async def resolve_datasource_config(config: Dict[str, Any]) -> Dict[str, Any]:
         return config
 
 
-async def get_latest_file_from_datasource(datasource_id: str) -> Optional[str]:
-    """Get the latest file uploaded to a data source"""
-    from app.core.supabase import get_supabase
-
+async def get_latest_file_from_datasource(
+    datasource_id: str,
+) -> Optional[Dict[str, Any]]:
+    """Get the file upload record of the latest file uploaded to a data source"""
     supabase = await get_supabase()
 
     response = (
         await supabase.table("file_uploads")
-        .select("id")
+        .select("*")
         .eq("data_source_id", datasource_id)
         .eq("upload_status", "completed")
         .order("uploaded_at", desc=True)
@@ -1730,7 +2724,7 @@ async def get_latest_file_from_datasource(datasource_id: str) -> Optional[str]:
     )
 
     if response.data:
-        return response.data[0]["id"]
+        return response.data[0]
 
     return None
 
@@ -1740,25 +2734,56 @@ def build_connection_string(
 ) -> str:
     """Build database connection string from details and credentials"""
     db_type = connection_details.get("db_type", "postgresql")
-    host = connection_details["host"]
     port = connection_details["port"]
-    database = connection_details["database"]
 
-    username = ""
-    password = ""
+    # Datasources opting into async_mode are queried on the event loop
+    # through asyncpg instead of blocking a thread on psycopg2
+    if (
+        db_type == "postgresql"
+        and connection_details.get("async_mode")
+        and ASYNCPG_AVAILABLE
+    ):
+        db_type = "postgresql+asyncpg"
+
+    username = None
+    password = None
 
     if credentials:
-        username = credentials.get("username", "")
-        password = credentials.get("password", "")
-
-    if db_type == "postgresql":
-        return f"postgresql://{username}:{password}@{host}:{port}/{database}"
-    elif db_type == "mysql":
-        return f"mysql://{username}:{password}@{host}:{port}/{database}"
-    elif db_type == "mssql":
-        return f"mssql://{username}:{password}@{host}:{port}/{database}"
-    else:
-        return f"{db_type}://{username}:{password}@{host}:{port}/{database}"
+        username = credentials.get("username") or None
+        password = credentials.get("password") or None
+
+    return _build_connection_string(
+        db_type,
+        connection_details["host"],
+        int(port) if port else None,
+        connection_details["database"],
+        username,
+        password,
+    )
+
+
+@lru_cache(maxsize=256)
+def _build_connection_string(
+    db_type: str,
+    host: str,
+    port: Optional[int],
+    database: str,
+    username: Optional[str],
+    password: Optional[str],
+) -> str:
+    from sqlalchemy.engine import URL
+
+    # URL.create escapes characters such as "@", ":" or "/" in the credentials,
+    # which would otherwise corrupt the URL
+    url = URL.create(
+        drivername=db_type,
+        username=username,
+        password=password,
+        host=host,
+        port=port,
+        database=database,
+    )
+    return url.render_as_string(hide_password=False)
 
 
 async def execute_fibo_mapper_step(
@@ -1790,9 +2815,6 @@ async def execute_fibo_mapper_step(
     Returns:
         Dictionary with mapping results, statistics, and Neo4j storage status
     """
-    from app.services.fibo import FIBOService
-    from app.utils.neo4j import get_neo4j_driver
-
     # Validate input data
     validate_fibo_mapper_input(input_data or {})
 
@@ -1889,7 +2911,7 @@ async def execute_fibo_mapper_step(
                 ),
             },
             "mapping_statistics": mapping_stats,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utcnow_iso(),
         }
 
     except Exception as e:
@@ -2127,16 +3149,12 @@ async def find_similar_entity_mapping(
     fibo_service: FIBOService,
 ) -> Optional[Dict[str, Any]]:
     """Find similar entity mapping using fuzzy matching"""
-    from difflib import SequenceMatcher
-
     best_match = None
     best_similarity = 0.0
 
     # Try fuzzy matching on entity types
     for mapped_type, mapping in entity_mappings.items():
-        similarity = SequenceMatcher(
-            None, entity_type.lower(), mapped_type.lower()
-        ).ratio()
+        similarity = text_similarity(entity_type.lower(), mapped_type.lower())
 
         if (
             similarity > best_similarity and similarity > 0.6
@@ -2185,16 +3203,12 @@ async def find_similar_relationship_mapping(
     fibo_service: FIBOService,
 ) -> Optional[Dict[str, Any]]:
     """Find similar relationship mapping using fuzzy matching"""
-    from difflib import SequenceMatcher
-
     best_match = None
     best_similarity = 0.0
 
     # Try fuzzy matching on relationship types
     for mapped_type, mapping in relationship_mappings.items():
-        similarity = SequenceMatcher(
-            None, rel_type.lower(), mapped_type.lower()
-        ).ratio()
+        similarity = text_similarity(rel_type.lower(), mapped_type.lower())
 
         if (
             similarity > best_similarity and similarity > 0.6
@@ -2358,8 +3372,6 @@ def sanitize_neo4j_label(label: str) -> str:
         return "Unknown"
 
     # Replace spaces and special characters with underscores
-    import re
-
     sanitized = re.sub(r"[^a-zA-Z0-9_]", "_", label)
 
     # Ensure it starts with a letter or underscore
@@ -2431,6 +3443,25 @@ async def log_mapping_results(
         logger.info(f"FIBO properties used: {fibo_properties_used}")
 
 
+# =============================================
+# STEP DISPATCH
+# =============================================
+
+# Step handlers by type, looked up by execute_step_by_type. Additional step
+# types can be supported by adding their handler here.
+_STEP_DISPATCH: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
+    PipelineStepType.FILE_READER: execute_file_reader_step,
+    PipelineStepType.API_FETCHER: execute_api_fetcher_step,
+    PipelineStepType.DATABASE_EXTRACTOR: execute_database_extractor_step,
+    PipelineStepType.TEXT_EXTRACTOR: execute_text_extractor_step,
+    PipelineStepType.LLM_ENTITY_EXTRACTOR: execute_llm_entity_extractor_step,
+    PipelineStepType.ENTITY_RESOLUTION: execute_entity_resolution_step,
+    PipelineStepType.FIBO_MAPPER: execute_fibo_mapper_step,
+    PipelineStepType.KNOWLEDGE_GRAPH_WRITER: execute_knowledge_graph_writer_step,
+    PipelineStepType.CUSTOM_PYTHON: execute_custom_python_step,
+}
+
+
 # =============================================
 # EXISTING TASK IMPLEMENTATIONS
 # =============================================
@@ -2443,20 +3474,17 @@ async def cancel_pipeline_run_task(
     pipeline_run_id: str, pipeline_id: str
 ) -> Dict[str, Any]:
     """Cancel a running pipeline"""
-    from app.services.pipeline import PipelineService
-
-    pipeline_service = PipelineService()
-
     try:
         # Update pipeline run status to cancelled
-        await pipeline_service.update_pipeline_run(
+        await update_pipeline_run_status(
             pipeline_run_id,
             pipeline_id=pipeline_id,
             run_update=PipelineRunUpdate(
                 status=PipelineRunStatus.CANCELLED,
-                end_time=datetime.now(timezone.utc).isoformat(),
+                end_time=utcnow_iso(),
             ),
         )
+        await get_step_service().cancel_pending_step_runs(pipeline_run_id)
 
         # TODO: Cancel any running step tasks
         # This would require tracking and revoking celery task IDs
@@ -2473,11 +3501,9 @@ async def cancel_pipeline_run_task(
 @async_task
 async def process_file_task(file_id: str):
     """Process a file to extract entities and relationships."""
-    from app.tasks.extraction import process_file
-
     try:
         logger.info(f"Processing file {file_id}")
-        result = await process_file(UUID(file_id))
+        result = await extraction.process_file(UUID(file_id))
         return {"success": result}
     except Exception as e:
         logger.error(f"Error processing file {file_id}: {str(e)}")
@@ -2492,11 +3518,8 @@ async def sync_to_neo4j_task(entity_ids=None, relationship_ids=None, batch_size=
                                           sync_relationships_to_neo4j)
 
     try:
-        if entity_ids:
-            entity_ids = [UUID(id) for id in entity_ids]
-        if relationship_ids:
-            relationship_ids = [UUID(id) for id in relationship_ids]
-
+        # Relationships are created between the Neo4j nodes of their
+        # entities, so the entities have to be synced first
         entity_result = await sync_entities_to_neo4j(
             entity_ids=entity_ids, batch_size=batch_size
         )
@@ -1,12 +1,14 @@
 # app/utils/file_handler.py
 
 import asyncio
+import contextlib
+import io
 import logging
 import mimetypes
 import os
 import tempfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import IO, Any, BinaryIO, ContextManager, Dict, List, Optional, Union
 
 # PDF processing
 try:
@@ -24,6 +26,13 @@ try:
 except ImportError:
     OFFICE_AVAILABLE = False
 
+# Columnar formats
+try:
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
 import csv
 # Text processing
 import json
@@ -45,6 +54,7 @@ class FileProcessor:
             'application/json': self._process_json,
             'application/xml': self._process_xml,
             'text/xml': self._process_xml,
+            'application/vnd.apache.parquet': self._process_parquet,
             
             # PDF formats
             'application/pdf': self._process_pdf,
@@ -61,22 +71,27 @@ class FileProcessor:
     
     async def process_file(
         self, 
-        file_path: str, 
-        file_type: Optional[str] = None
+        source: Union[str, BinaryIO], 
+        file_type: Optional[str] = None,
+        file_name: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Process file and extract text content with metadata
         
         Args:
-            file_path: Path to the file
+            source: Path to the file, or the file opened in binary mode
             file_type: MIME type of the file (auto-detected if None)
+            file_name: Name of the file, used for detection when source is
+                an open file
             
         Returns:
             Dictionary containing extracted content and metadata
         """
         
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
+        file_path = source if isinstance(source, str) else file_name or ""
+        
+        if isinstance(source, str) and not os.path.exists(source):
+            raise FileNotFoundError(f"File not found: {source}")
         
         # Auto-detect file type if not provided
         if not file_type:
@@ -87,12 +102,12 @@ class FileProcessor:
             raise ValueError(f"Unsupported file format: {file_type}")
         
         # Get file info
-        file_info = self._get_file_info(file_path)
+        file_info = self._get_file_info(source, file_path)
         
         try:
             # Process file based on type
             processor = self.supported_formats[file_type]
-            content_data = await processor(file_path)
+            content_data = await processor(source)
             
             return {
                 "success": True,
@@ -124,6 +139,7 @@ class FileProcessor:
         extension_map = {
             '.txt': 'text/plain',
             '.csv': 'text/csv',
+            '.parquet': 'application/vnd.apache.parquet',
             '.json': 'application/json',
             '.xml': 'application/xml',
             '.pdf': 'application/pdf',
@@ -137,32 +153,58 @@ class FileProcessor:
         
         return extension_map.get(extension, 'application/octet-stream')
     
-    def _get_file_info(self, file_path: str) -> Dict[str, Any]:
+    def _get_file_info(self, source: Union[str, BinaryIO], file_path: str) -> Dict[str, Any]:
         """Get file metadata"""
         
-        stat = os.stat(file_path)
+        if isinstance(source, str):
+            stat = os.stat(source)
+            size, created, modified = stat.st_size, stat.st_ctime, stat.st_mtime
+        else:
+            size, created, modified = source.seek(0, io.SEEK_END), None, None
         
         return {
             "name": os.path.basename(file_path),
-            "size": stat.st_size,
-            "created": stat.st_ctime,
-            "modified": stat.st_mtime,
+            "size": size,
+            "created": created,
+            "modified": modified,
             "extension": Path(file_path).suffix.lower()
         }
     
+    def _rewind(self, source: Union[str, BinaryIO]) -> Union[str, BinaryIO]:
+        """Return a path unchanged, or an open file positioned at its start"""
+        
+        if not isinstance(source, str):
+            source.seek(0)
+        return source
+    
+    def _open_binary(self, source: Union[str, BinaryIO]) -> ContextManager[BinaryIO]:
+        """Open a path for binary reading, or rewind an open binary file"""
+        
+        if isinstance(source, str):
+            return open(source, 'rb')
+        # The caller owns the open file; do not close it on exit
+        return contextlib.nullcontext(self._rewind(source))
+    
+    def _open_text(self, source: Union[str, BinaryIO], encoding: str = 'utf-8') -> IO[str]:
+        """Open a path or an open binary file for reading as text"""
+        
+        if isinstance(source, str):
+            return open(source, 'r', encoding=encoding)
+        return io.StringIO(self._rewind(source).read().decode(encoding))
+    
     # =============================================
     # TEXT FORMAT PROCESSORS
     # =============================================
     
-    async def _process_text(self, file_path: str) -> Dict[str, Any]:
+    async def _process_text(self, source: Union[str, BinaryIO]) -> Dict[str, Any]:
         """Process plain text file"""
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
+            with self._open_text(source) as file:
                 content = file.read()
         except UnicodeDecodeError:
             # Try with different encoding
-            with open(file_path, 'r', encoding='latin-1') as file:
+            with self._open_text(source, 'latin-1') as file:
                 content = file.read()
         
         return {
@@ -172,13 +214,13 @@ class FileProcessor:
             "word_count": len(content.split())
         }
     
-    async def _process_csv(self, file_path: str) -> Dict[str, Any]:
+    async def _process_csv(self, source: Union[str, BinaryIO]) -> Dict[str, Any]:
         """Process CSV file"""
         
         rows = []
         headers = []
         
-        with open(file_path, 'r', encoding='utf-8') as file:
+        with self._open_text(source) as file:
             reader = csv.reader(file)
             
             # Get headers
@@ -213,10 +255,45 @@ class FileProcessor:
             "sample_rows": rows[:10]
         }
     
-    async def _process_json(self, file_path: str) -> Dict[str, Any]:
+    async def _process_parquet(self, source: Union[str, BinaryIO]) -> Dict[str, Any]:
+        """Process Parquet file"""
+        
+        if not PARQUET_AVAILABLE:
+            raise ImportError("Parquet processing library not available. Install pyarrow.")
+        
+        parquet_file = pq.ParquetFile(self._rewind(source))
+        headers = parquet_file.schema_arrow.names
+        
+        # Read only the first batch of rows (limit for safety)
+        batch = next(parquet_file.iter_batches(batch_size=10000), None)
+        rows = [list(row.values()) for row in batch.to_pylist()] if batch else []
+        
+        # Convert to text for entity extraction
+        text_content = []
+        
+        # Add headers as context
+        if headers:
+            text_content.append("Columns: " + ", ".join(headers))
+        
+        # Add sample rows as text
+        for row in rows[:100]:  # First 100 rows
+            row_text = " | ".join(f"{header}: {cell}" 
+                                 for header, cell in zip(headers, row) if cell is not None and str(cell).strip())
+            if row_text:
+                text_content.append(row_text)
+        
+        return {
+            "text": "\n".join(text_content),
+            "headers": headers,
+            "row_count": parquet_file.metadata.num_rows,
+            "column_count": len(headers),
+            "sample_rows": rows[:10]
+        }
+    
+    async def _process_json(self, source: Union[str, BinaryIO]) -> Dict[str, Any]:
         """Process JSON file"""
         
-        with open(file_path, 'r', encoding='utf-8') as file:
+        with self._open_text(source) as file:
             data = json.load(file)
         
         # Convert JSON structure to readable text
@@ -254,11 +331,11 @@ class FileProcessor:
         
         return "\n".join(text_parts)
     
-    async def _process_xml(self, file_path: str) -> Dict[str, Any]:
+    async def _process_xml(self, source: Union[str, BinaryIO]) -> Dict[str, Any]:
         """Process XML file"""
         
         try:
-            tree = ET.parse(file_path)
+            tree = ET.parse(self._rewind(source))
             root = tree.getroot()
             
             # Extract text content
@@ -272,7 +349,7 @@ class FileProcessor:
             
         except ET.ParseError as e:
             # Try to read as text if XML parsing fails
-            with open(file_path, 'r', encoding='utf-8') as file:
+            with self._open_text(source) as file:
                 content = file.read()
             
             return {
@@ -307,7 +384,7 @@ class FileProcessor:
     # PDF PROCESSORS
     # =============================================
     
-    async def _process_pdf(self, file_path: str) -> Dict[str, Any]:
+    async def _process_pdf(self, source: Union[str, BinaryIO]) -> Dict[str, Any]:
         """Process PDF file"""
         
         if not PDF_AVAILABLE:
@@ -319,7 +396,7 @@ class FileProcessor:
         
         try:
             # Try pdfplumber first (better text extraction)
-            with pdfplumber.open(file_path) as pdf:
+            with pdfplumber.open(self._rewind(source)) as pdf:
                 page_count = len(pdf.pages)
                 
                 text_parts = []
@@ -343,7 +420,7 @@ class FileProcessor:
             # Fallback to PyPDF2
             logger.warning(f"pdfplumber failed, trying PyPDF2: {e}")
             
-            with open(file_path, 'rb') as file:
+            with self._open_binary(source) as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 page_count = len(pdf_reader.pages)
                 
@@ -376,13 +453,13 @@ class FileProcessor:
     # OFFICE DOCUMENT PROCESSORS
     # =============================================
     
-    async def _process_docx(self, file_path: str) -> Dict[str, Any]:
+    async def _process_docx(self, source: Union[str, BinaryIO]) -> Dict[str, Any]:
         """Process Word document"""
         
         if not OFFICE_AVAILABLE:
             raise ImportError("Office processing libraries not available. Install python-docx.")
         
-        doc = docx.Document(file_path)
+        doc = docx.Document(self._rewind(source))
         
         # Extract paragraphs
         paragraphs = []
@@ -411,13 +488,13 @@ class FileProcessor:
             "metadata": metadata
         }
     
-    async def _process_xlsx(self, file_path: str) -> Dict[str, Any]:
+    async def _process_xlsx(self, source: Union[str, BinaryIO]) -> Dict[str, Any]:
         """Process Excel spreadsheet"""
         
         if not OFFICE_AVAILABLE:
             raise ImportError("Office processing libraries not available. Install openpyxl.")
         
-        workbook = load_workbook(file_path, read_only=True)
+        workbook = load_workbook(self._rewind(source), read_only=True)
         
         text_parts = []
         sheet_info = {}
@@ -456,7 +533,7 @@ class FileProcessor:
             "word_count": len(text_content.split())
         }
     
-    async def _process_doc(self, file_path: str) -> Dict[str, Any]:
+    async def _process_doc(self, source: Union[str, BinaryIO]) -> Dict[str, Any]:
         """Process legacy Word document"""
         
         # For .doc files, we'd need python-docx2txt or similar
@@ -471,13 +548,13 @@ class FileProcessor:
     # WEB FORMAT PROCESSORS
     # =============================================
     
-    async def _process_html(self, file_path: str) -> Dict[str, Any]:
+    async def _process_html(self, source: Union[str, BinaryIO]) -> Dict[str, Any]:
         """Process HTML file"""
         
         try:
             from bs4 import BeautifulSoup
             
-            with open(file_path, 'r', encoding='utf-8') as file:
+            with self._open_text(source) as file:
                 html_content = file.read()
             
             soup = BeautifulSoup(html_content, 'html.parser')
@@ -505,7 +582,7 @@ class FileProcessor:
             
         except ImportError:
             # Fallback without BeautifulSoup
-            with open(file_path, 'r', encoding='utf-8') as file:
+            with self._open_text(source) as file:
                 html_content = file.read()
             
             # Simple HTML tag removal
@@ -520,10 +597,10 @@ class FileProcessor:
                 "processing_method": "simple_regex"
             }
     
-    async def _process_markdown(self, file_path: str) -> Dict[str, Any]:
+    async def _process_markdown(self, source: Union[str, BinaryIO]) -> Dict[str, Any]:
         """Process Markdown file"""
         
-        with open(file_path, 'r', encoding='utf-8') as file:
+        with self._open_text(source) as file:
             markdown_content = file.read()
         
         try:
@@ -579,11 +656,15 @@ def get_file_processor() -> FileProcessor:
     return _file_processor
 
 
-async def process_file(file_path: str, file_type: Optional[str] = None) -> Dict[str, Any]:
-    """Process file using global processor"""
+async def process_file(
+    source: Union[str, BinaryIO],
+    file_type: Optional[str] = None,
+    file_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """Process a file, given by path or as an open binary file, using global processor"""
     
     processor = get_file_processor()
-    return await processor.process_file(file_path, file_type)
+    return await processor.process_file(source, file_type, file_name)
 
 
 def get_file_type(file_path: str, provided_type: Optional[str] = None) -> str:
@@ -616,9 +697,8 @@ async def save_upload_file(upload_file, destination_path: str) -> str:
     
     os.makedirs(os.path.dirname(destination_path), exist_ok=True)
     
-    with open(destination_path, "wb") as buffer:
-        content = await upload_file.read()
-        buffer.write(content)
+    content = await upload_file.read()
+    await asyncio.to_thread(Path(destination_path).write_bytes, content)
     
     return destination_path
 
@@ -635,8 +715,9 @@ def cleanup_temp_file(file_path: str):
     """Remove temporary file safely"""
     
     try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logger.warning(f"Failed to cleanup temp file {file_path}: {e}")
 
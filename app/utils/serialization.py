@@ -0,0 +1,29 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize to a JSON string, using orjson when it is installed"""
+
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=str, option=option).decode()
+
+    return json.dumps(obj, default=str, sort_keys=sort_keys)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize a JSON document, using orjson when it is installed"""
+
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+
+    return json.loads(data)
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.supabase import get_supabase
+
+logger = logging.getLogger(__name__)
+
+
+class StatusWriter:
+    """Coalesce pipeline status updates and write them in batches"""
+
+    def __init__(
+        self, flush_interval: float = 0.05, max_batch: int = 100, max_attempts: int = 3
+    ):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_attempts = max_attempts
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._attempts: Dict[Tuple[str, str], int] = {}
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def put(self, table: str, row_id: str, patch: Dict[str, Any]) -> None:
+        """
+        Queue an update of a row. Patches for the same row are merged and
+        written by the next flush, at most `flush_interval` seconds later.
+
+        Args:
+            table: Table name
+            row_id: ID of the row to update
+            patch: Columns to update
+        """
+        self._pending.setdefault((table, row_id), {}).update(patch)
+
+        if len(self._pending) >= self.max_batch:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def write(self, table: str, row_id: str, patch: Dict[str, Any]) -> None:
+        """Queue an update and wait until it has been written"""
+        await self.put(table, row_id, patch)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Write all pending updates, waiting for any write already in flight.
+        Updates that could not be written are queued again for the next flush,
+        up to `max_attempts` times, and the first error is raised.
+        """
+        async with self._lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return
+
+            try:
+                errors = await self._write(batch)
+            except Exception as e:
+                errors = {key: e for key in batch}
+
+            for key, error in errors.items():
+                logger.error(f"Failed to write status update: {error}")
+
+                attempts = self._attempts.get(key, 0) + 1
+                if attempts >= self.max_attempts:
+                    logger.error(
+                        f"Dropping status update of {key[0]} {key[1]} "
+                        f"after {attempts} attempts"
+                    )
+                    self._attempts.pop(key, None)
+                    continue
+
+                # Patches queued while writing are newer and take precedence
+                self._attempts[key] = attempts
+                self._pending[key] = {**batch[key], **self._pending.get(key, {})}
+
+            for key in batch.keys() - errors.keys():
+                self._attempts.pop(key, None)
+
+            if errors:
+                raise next(iter(errors.values()))
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Background status flush failed: {e}")
+            # Retry the updates queued again by the failed flush
+            if self._pending and self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _write(
+        self, batch: Dict[Tuple[str, str], Dict[str, Any]]
+    ) -> Dict[Tuple[str, str], Exception]:
+        """Write a batch of updates, returning the errors of the failed ones"""
+        supabase = await get_supabase()
+
+        results = await asyncio.gather(
+            *[
+                supabase.from_(table).update(patch).eq("id", row_id).execute()
+                for (table, row_id), patch in batch.items()
+            ],
+            return_exceptions=True,
+        )
+
+        return {
+            key: result
+            for key, result in zip(batch, results)
+            if isinstance(result, Exception)
+        }
+
+
+# Global writer instance
+_status_writer: Optional[StatusWriter] = None
+
+
+def get_status_writer() -> StatusWriter:
+    """Get global status writer instance"""
+
+    global _status_writer
+
+    if _status_writer is None:
+        _status_writer = StatusWriter()
+
+    return _status_writer
@@ -24,17 +24,56 @@ fi
 rm -f /tmp/celery_*.pid 2>/dev/null || true
 
 
-# Start Celery worker for pipeline tasks
+# Start Celery worker for pipeline tasks. Orchestration tasks are short, so
+# this worker may reserve several at a time.
 echo "Starting Celery worker for pipeline tasks..."
 celery -A app.tasks.worker worker \
     --loglevel=info \
-    --queues=pipeline,steps,celery \
-    --concurrency=4 \
+    --queues=pipeline,celery \
+    --prefetch-multiplier=4 \
     --hostname=pipeline-worker@%h \
     --detach \
     --pidfile=/tmp/celery_pipeline_worker.pid \
     --logfile=/tmp/celery_pipeline_worker.log
 
+# Start Celery worker for step tasks. Steps can run for minutes, so each
+# thread only reserves the task it runs.
+echo "Starting Celery worker for step tasks..."
+celery -A app.tasks.worker worker \
+    --loglevel=info \
+    --queues=steps \
+    --prefetch-multiplier=1 \
+    --hostname=steps-worker@%h \
+    --detach \
+    --pidfile=/tmp/celery_steps_worker.pid \
+    --logfile=/tmp/celery_steps_worker.log
+
+# Start Celery worker for long-running step tasks (LLM extraction, graph
+# writes, API fetches), so that short steps do not queue behind them.
+echo "Starting Celery worker for long-running step tasks..."
+celery -A app.tasks.worker worker \
+    --loglevel=info \
+    --queues=steps_heavy \
+    --prefetch-multiplier=1 \
+    --hostname=steps-heavy-worker@%h \
+    --detach \
+    --pidfile=/tmp/celery_steps_heavy_worker.pid \
+    --logfile=/tmp/celery_steps_heavy_worker.log
+
+# Start Celery worker for CPU-bound steps (custom Python). These run in
+# processes, one per core, instead of sharing the GIL of the thread pool.
+echo "Starting Celery worker for CPU-bound step tasks..."
+celery -A app.tasks.worker worker \
+    --loglevel=info \
+    --queues=steps_cpu \
+    --pool=prefork \
+    --concurrency=$(nproc) \
+    --prefetch-multiplier=1 \
+    --hostname=steps-cpu-worker@%h \
+    --detach \
+    --pidfile=/tmp/celery_steps_cpu_worker.pid \
+    --logfile=/tmp/celery_steps_cpu_worker.log
+
 # Start Celery beat scheduler (if you have scheduled pipelines)
 echo "Starting Celery beat scheduler..."
 celery -A app.tasks.worker beat \
@@ -0,0 +1,55 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import supabase as supabase_module
+
+
+class FakeQuery:
+    """Query builder recording its calls, answered by FakeSupabase.response"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args):
+            self.calls.append((name, *args))
+            return self
+
+        return method
+
+    def args(self, name):
+        """Arguments of the first call of a builder method"""
+        return next(call[1:] for call in self.calls if call[0] == name)
+
+    async def execute(self):
+        # Let queries sent together start before this one completes
+        await asyncio.sleep(0)
+        data = self.client.response(self)
+        self.client.queries.append(self)
+        return SimpleNamespace(data=data)
+
+
+class FakeSupabase:
+    """Supabase client keeping the queries that succeeded"""
+
+    def __init__(self):
+        self.queries = []
+        # Rows returned for a query; raising fails the query
+        self.response = lambda query: []
+
+    def from_(self, table):
+        return FakeQuery(self, table)
+
+    table = from_
+
+
+@pytest.fixture
+def supabase(monkeypatch):
+    """Fake client returned by get_supabase"""
+    client = FakeSupabase()
+    monkeypatch.setattr(supabase_module, "_supabase_client", client)
+    return client
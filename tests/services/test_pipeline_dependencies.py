@@ -0,0 +1,75 @@
+import pytest
+
+from app.tasks.worker import (
+    CircularDependencyError,
+    find_dependency_cycle,
+    organize_steps_by_dependency_levels,
+)
+
+
+def make_step(step_id, inputs="", run_order=0):
+    return {"id": step_id, "inputs": inputs, "run_order": run_order}
+
+
+def test_simple_cycle():
+    dependents = {"a": ["b"], "b": ["c"], "c": ["a"]}
+
+    assert find_dependency_cycle({"a", "b", "c"}, dependents) == ["a", "b", "c"]
+
+
+def test_smallest_cycle_is_returned():
+    dependents = {"a": ["b"], "b": ["c"], "c": ["d", "a"], "d": ["e"], "e": ["d"]}
+
+    assert find_dependency_cycle({"a", "b", "c", "d", "e"}, dependents) == ["d", "e"]
+
+
+def test_self_loop():
+    dependents = {"a": ["a", "b"], "b": []}
+
+    assert find_dependency_cycle({"a", "b"}, dependents) == ["a"]
+
+
+def test_dag_has_no_cycle():
+    dependents = {"a": ["b", "c"], "b": ["d"], "c": ["d"], "d": []}
+
+    assert find_dependency_cycle({"a", "b", "c", "d"}, dependents) == []
+
+
+def test_steps_outside_the_search_are_ignored():
+    dependents = {"a": ["b"], "b": ["a"]}
+
+    assert find_dependency_cycle({"a"}, dependents) == []
+
+
+def test_levels_follow_dependencies():
+    steps = [
+        make_step("c", "a,b", run_order=2),
+        make_step("b", run_order=1),
+        make_step("a", run_order=0),
+        make_step("d", "c", run_order=3),
+    ]
+
+    levels = organize_steps_by_dependency_levels(steps)
+
+    assert [[step["id"] for step in level] for level in levels] == [
+        ["a", "b"],
+        ["c"],
+        ["d"],
+    ]
+
+
+def test_circular_dependency_error():
+    steps = [make_step("a"), make_step("b", "a,c"), make_step("c", "b")]
+
+    with pytest.raises(CircularDependencyError) as exc_info:
+        organize_steps_by_dependency_levels(steps)
+
+    assert exc_info.value.cycle == ["b", "c"]
+    assert "b -> c -> b" in str(exc_info.value)
+
+
+def test_unknown_dependency_error():
+    steps = [make_step("a"), make_step("b", "a,missing")]
+
+    with pytest.raises(Exception, match=r"depend on unknown steps \['missing'\]"):
+        organize_steps_by_dependency_levels(steps)
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.pipeline_step import PipelineRunStatus
+from app.services.pipeline_step import PipelineStepService
+
+
+def make_step_runs(count):
+    return [
+        {
+            "pipeline_run_id": "run-1",
+            "step_id": f"step-{i}",
+            "status": PipelineRunStatus.PENDING,
+            "run_order": i,
+        }
+        for i in range(count)
+    ]
+
+
+def test_bulk_create_step_runs_inserts_once(supabase):
+    step_runs = make_step_runs(3)
+    supabase.response = lambda query: [
+        {"id": f"step-run-{i}", **row} for i, row in enumerate(query.args("insert")[0])
+    ]
+
+    created = asyncio.run(PipelineStepService().bulk_create_step_runs(step_runs))
+
+    assert len(supabase.queries) == 1
+    query = supabase.queries[0]
+    assert query.table == "pipeline_step_runs"
+    assert query.calls == [("insert", step_runs)]
+    assert [row["id"] for row in created] == ["step-run-0", "step-run-1", "step-run-2"]
+
+
+def test_bulk_create_step_runs_fails_on_missing_rows(supabase):
+    supabase.response = lambda query: query.args("insert")[0][:1]
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(PipelineStepService().bulk_create_step_runs(make_step_runs(2)))
+
+    assert exc_info.value.status_code == 500
+
+
+def test_cancel_pending_step_runs(supabase):
+    asyncio.run(PipelineStepService().cancel_pending_step_runs("run-1"))
+
+    assert len(supabase.queries) == 1
+    query = supabase.queries[0]
+    assert query.table == "pipeline_step_runs"
+    assert query.calls == [
+        ("update", {"status": PipelineRunStatus.CANCELLED.value}),
+        ("eq", "pipeline_run_id", "run-1"),
+        ("eq", "status", PipelineRunStatus.PENDING.value),
+    ]
@@ -0,0 +1,132 @@
+import random
+import string
+from unittest.mock import patch
+
+import pytest
+
+from app.tasks import worker
+
+
+def make_entity(text, entity_type="ORG", confidence=0.5, **extra):
+    return {"text": text, "type": entity_type, "confidence": confidence, **extra}
+
+
+def near_duplicates(count, seed=0):
+    """Pairs of random names and a misspelled, uppercased copy of each"""
+    rng = random.Random(seed)
+    entities = []
+    for i in range(count):
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(16))
+        entities.append(make_entity(name, confidence=0.5, index=i))
+        entities.append(make_entity(name[:-1].upper() + "X", confidence=0.9, index=i))
+    return entities
+
+
+def test_exact_match_keeps_most_confident_entity():
+    entities = [
+        make_entity("Vingroup", confidence=0.6),
+        make_entity("vingroup", confidence=0.8),
+        make_entity("Vingroup", entity_type="PERSON"),
+    ]
+
+    resolved = worker.resolve_exact_match(entities)
+
+    assert resolved == [entities[1], entities[2]]
+
+
+def test_fuzzy_match_merges_near_duplicates():
+    entities = [
+        make_entity("Vietcombank", confidence=0.6),
+        make_entity("Vietcombank.", confidence=0.9),
+        make_entity("Vietcombank", entity_type="PERSON"),
+        make_entity("Techcombank"),
+    ]
+
+    resolved = worker.resolve_fuzzy_match(entities, threshold=0.9)
+
+    assert resolved == [entities[1], entities[2], entities[3]]
+
+
+def test_fuzzy_match_skips_pairs_of_very_different_lengths():
+    entities = [make_entity("BIDV"), make_entity("BIDV Bank of Investment")]
+
+    assert worker.resolve_fuzzy_match(entities, threshold=0.5) == entities
+
+
+@pytest.mark.skipif(not worker.DATASKETCH_AVAILABLE, reason="datasketch missing")
+def test_lsh_candidates_keep_similar_pairs():
+    entities = near_duplicates(worker.LSH_MIN_BUCKET_SIZE)
+    texts = [entity["text"].lower() for entity in entities]
+
+    candidates = worker.fuzzy_match_candidates(entities, texts, threshold=0.9)
+
+    for i in range(0, len(entities), 2):
+        assert i + 1 in candidates[i]
+    all_pairs = len(entities) * (len(entities) - 1) // 2
+    assert sum(len(c) for c in candidates) < all_pairs // 10
+
+
+@pytest.mark.skipif(not worker.DATASKETCH_AVAILABLE, reason="datasketch missing")
+def test_lsh_resolution_matches_pairwise_resolution():
+    entities = near_duplicates(worker.LSH_MIN_BUCKET_SIZE)
+
+    with_lsh = worker.resolve_fuzzy_match(entities, threshold=0.9)
+    with patch.object(worker, "LSH_MIN_BUCKET_SIZE", len(entities) + 1):
+        pairwise = worker.resolve_fuzzy_match(entities, threshold=0.9)
+
+    assert with_lsh == pairwise
+    assert sorted(entity["index"] for entity in with_lsh) == list(
+        range(worker.LSH_MIN_BUCKET_SIZE)
+    )
+    assert all(entity["confidence"] == 0.9 for entity in with_lsh)
+
+
+SIMILARITY_PAIRS = [
+    ("apple inc", "apple inc."),
+    ("microsoft", "microsoft corp"),
+    ("vingroup", "vinagroup"),
+    ("ngân hàng", "ngan hang"),
+    ("abc", "xyz"),
+]
+
+
+@pytest.fixture
+def similarity_backend(request):
+    with patch.object(worker, "RAPIDFUZZ_AVAILABLE", request.param):
+        worker._text_similarity.cache_clear()
+        yield request.param
+    worker._text_similarity.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "similarity_backend",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                not worker.RAPIDFUZZ_AVAILABLE, reason="rapidfuzz missing"
+            ),
+        ),
+    ],
+    indirect=True,
+)
+def test_text_similarity(similarity_backend):
+    assert worker.text_similarity("vingroup", "vingroup") == 1.0
+    assert worker.text_similarity("apple inc", "apple inc.") == pytest.approx(18 / 19)
+    assert worker.text_similarity("microsoft", "microsoft corp") == (
+        worker.text_similarity("microsoft corp", "microsoft")
+    )
+    assert worker.text_similarity("abc", "xyz", cutoff=0.5) == 0.0
+    assert worker.text_similarity("vingroup", "vinagroup", cutoff=0.99) == 0.0
+
+
+@pytest.mark.skipif(not worker.RAPIDFUZZ_AVAILABLE, reason="rapidfuzz missing")
+@pytest.mark.parametrize("a, b", SIMILARITY_PAIRS)
+def test_rapidfuzz_scores_match_difflib(a, b):
+    with patch.object(worker, "RAPIDFUZZ_AVAILABLE", False):
+        worker._text_similarity.cache_clear()
+        expected = worker.text_similarity(a, b)
+    worker._text_similarity.cache_clear()
+
+    assert worker.text_similarity(a, b) == pytest.approx(expected)
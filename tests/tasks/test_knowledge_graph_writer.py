@@ -0,0 +1,44 @@
+import asyncio
+
+from app.tasks import worker
+
+
+def make_records(count):
+    return [{"n": n} for n in range(count)]
+
+
+def inserted_rows(query):
+    return [{"id": row["n"], **row} for row in query.args("insert")[0]]
+
+
+def inserts(supabase):
+    return [(query.table, len(query.args("insert")[0])) for query in supabase.queries]
+
+
+def test_insert_nothing(supabase):
+    assert asyncio.run(worker.insert_records("kg_entities", [], 100)) == []
+    assert supabase.queries == []
+
+
+def test_insert_in_one_request(supabase):
+    supabase.response = inserted_rows
+    records = make_records(worker.SINGLE_INSERT_MAX_ROWS)
+
+    rows = asyncio.run(worker.insert_records("kg_entities", records, 100))
+
+    assert inserts(supabase) == [("kg_entities", worker.SINGLE_INSERT_MAX_ROWS)]
+    assert [row["id"] for row in rows] == list(range(len(records)))
+
+
+def test_large_insert_is_split_in_batches(supabase):
+    supabase.response = inserted_rows
+    records = make_records(worker.SINGLE_INSERT_MAX_ROWS + 50)
+
+    rows = asyncio.run(worker.insert_records("kg_relationships", records, 400))
+
+    assert inserts(supabase) == [
+        ("kg_relationships", 400),
+        ("kg_relationships", 400),
+        ("kg_relationships", 250),
+    ]
+    assert [row["id"] for row in rows] == list(range(len(records)))
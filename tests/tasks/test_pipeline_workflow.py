@@ -0,0 +1,248 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from celery import signature
+
+from app.schemas.pipeline import PipelineRunStatus
+from app.schemas.pipeline_step import PipelineRunStatus as StepStatus
+from app.schemas.pipeline_step import PipelineStepType
+from app.tasks import worker
+
+PIPELINE_ID = "pipeline-1"
+RUN_ID = "run-1"
+
+
+def make_step(step_id, inputs="", fail=False):
+    return {
+        "id": step_id,
+        "step_type": PipelineStepType.TEXT_EXTRACTOR.value,
+        "config": {"fail": fail},
+        "inputs": inputs,
+        "run_order": 0,
+        "step_run_id": f"step-run-{step_id}",
+        "has_dependents": False,
+    }
+
+
+async def execute_step(step_type, config, input_data=None):
+    if config["fail"]:
+        raise ValueError("boom")
+    return {"ok": True}
+
+
+@pytest.fixture
+def pipeline_mocks():
+    step_service = AsyncMock()
+    step_service.get_failed_step_run.return_value = {
+        "id": "step-run-b",
+        "step_id": "b",
+        "error_message": "Step execution failed: boom",
+    }
+    status_writer = AsyncMock()
+
+    with patch.multiple(
+        worker,
+        get_step_service=lambda: step_service,
+        get_status_writer=lambda: status_writer,
+        resolve_step_input_data_from_db=AsyncMock(return_value={}),
+        execute_step_by_type=AsyncMock(side_effect=execute_step),
+        update_pipeline_run_status=AsyncMock(),
+        finish_pipeline_run=AsyncMock(),
+    ):
+        yield {
+            "step_service": step_service,
+            "status_writer": status_writer,
+            "execute_step_by_type": worker.execute_step_by_type,
+            "update_pipeline_run_status": worker.update_pipeline_run_status,
+            "finish_pipeline_run": worker.finish_pipeline_run,
+        }
+
+
+def task_signatures(sig):
+    """Signatures of the tasks of a canvas, including chord headers and bodies"""
+    if isinstance(sig, (list, tuple)):
+        for task in sig:
+            yield from task_signatures(task)
+        return
+
+    sig = signature(sig)
+    if sig.task == "celery.chord":
+        yield from task_signatures(sig.tasks)
+        yield from task_signatures(sig.body)
+    elif sig.task in ("celery.chain", "celery.group"):
+        yield from task_signatures(sig.tasks)
+    else:
+        yield sig
+
+
+def linked_errbacks(sig):
+    return [signature(errback) for errback in sig.options.get("link_error", [])]
+
+
+def test_every_step_links_the_errback():
+    levels = [
+        [make_step("a")],
+        [make_step("b", "a"), make_step("c", "a")],
+        [make_step("d", "b"), make_step("e", "c")],
+        [make_step("f", "d,e")],
+    ]
+
+    workflow = worker.create_pipeline_workflow(levels, PIPELINE_ID, RUN_ID)
+
+    step_sigs = [
+        sig for sig in task_signatures(workflow) if sig.task == "run_pipeline_step"
+    ]
+    assert sorted(sig.kwargs["step_id"] for sig in step_sigs) == list("abcdef")
+    for sig in step_sigs:
+        errbacks = linked_errbacks(sig)
+        assert [errback.task for errback in errbacks] == ["fail_pipeline_run"]
+        assert errbacks[0].immutable
+        assert errbacks[0].kwargs == {
+            "pipeline_id": PIPELINE_ID,
+            "pipeline_run_id": RUN_ID,
+        }
+
+
+def test_errback_ignores_failure_details(pipeline_mocks):
+    levels = [[make_step("a"), make_step("b", fail=True)]]
+    workflow = worker.create_pipeline_workflow(levels, PIPELINE_ID, RUN_ID)
+    step_sig = next(task_signatures(workflow))
+
+    # Celery calls errbacks with the request, exception and traceback
+    (errback,) = linked_errbacks(step_sig)
+    errback(SimpleNamespace(id="task-1"), ValueError("boom"), None)
+
+    run_update = pipeline_mocks["update_pipeline_run_status"].await_args.kwargs[
+        "run_update"
+    ]
+    assert run_update.status == PipelineRunStatus.FAILED
+    assert run_update.error_message == (
+        "Pipeline execution failed: Step b execution failed: "
+        "Step execution failed: boom"
+    )
+    pipeline_mocks["step_service"].cancel_pending_step_runs.assert_awaited_once_with(
+        RUN_ID
+    )
+
+
+def test_fail_pipeline_run_without_failed_step_run(pipeline_mocks):
+    pipeline_mocks["step_service"].get_failed_step_run.return_value = None
+
+    worker.fail_pipeline_run(pipeline_id=PIPELINE_ID, pipeline_run_id=RUN_ID)
+
+    run_update = pipeline_mocks["update_pipeline_run_status"].await_args.kwargs[
+        "run_update"
+    ]
+    assert run_update.status == PipelineRunStatus.FAILED
+    assert run_update.error_message == "Pipeline execution failed"
+    pipeline_mocks["step_service"].cancel_pending_step_runs.assert_awaited_once_with(
+        RUN_ID
+    )
+
+
+def test_failing_step_records_its_step_run(pipeline_mocks):
+    step = make_step("b", fail=True)
+
+    with pytest.raises(Exception, match="Step b execution failed"):
+        worker.run_pipeline_step_task(
+            pipeline_id=PIPELINE_ID,
+            step_id="b",
+            pipeline_run_id=RUN_ID,
+            step=step,
+        )
+
+    write = pipeline_mocks["status_writer"].write.await_args
+    assert write.args[:2] == ("pipeline_step_runs", "step-run-b")
+    assert write.args[2]["status"] == StepStatus.FAILED
+    assert write.args[2]["error_message"] == "Step execution failed: boom"
+
+
+def test_parallel_levels_complete_run(pipeline_mocks):
+    levels = [
+        [make_step("a"), make_step("b")],
+        [make_step("c", inputs="a,b"), make_step("d", inputs="a")],
+    ]
+    workflow = worker.create_pipeline_workflow(levels, PIPELINE_ID, RUN_ID)
+
+    workflow.apply()
+
+    assert pipeline_mocks["execute_step_by_type"].await_count == 4
+    pipeline_mocks["update_pipeline_run_status"].assert_not_awaited()
+    pipeline_mocks["finish_pipeline_run"].assert_awaited_once_with(PIPELINE_ID, RUN_ID)
+
+
+def test_run_creates_pending_step_runs(pipeline_mocks):
+    steps = [make_step("a"), make_step("b", inputs="a")]
+    for step in steps:
+        del step["step_run_id"]
+    step_service = pipeline_mocks["step_service"]
+    step_service.get_pipeline_steps.return_value = SimpleNamespace(data=steps)
+    step_service.bulk_create_step_runs.side_effect = lambda rows: [
+        {"id": f"step-run-{row['step_id']}", **row} for row in rows
+    ]
+    workflow = MagicMock()
+    workflow.apply_async.return_value = SimpleNamespace(id="workflow-1")
+
+    with patch.object(
+        worker, "create_pipeline_workflow", return_value=workflow
+    ) as create_workflow:
+        result = worker.run_pipeline_task(PIPELINE_ID, RUN_ID)
+
+    assert result["workflow_id"] == "workflow-1"
+    step_service.bulk_create_step_runs.assert_awaited_once_with(
+        [
+            {
+                "pipeline_run_id": RUN_ID,
+                "step_id": step_id,
+                "status": StepStatus.PENDING,
+                "run_order": 0,
+            }
+            for step_id in ("a", "b")
+        ]
+    )
+    levels = create_workflow.call_args.args[0]
+    assert [[step["step_run_id"] for step in level] for level in levels] == [
+        ["step-run-a"],
+        ["step-run-b"],
+    ]
+    step_service.cancel_pending_step_runs.assert_not_awaited()
+
+
+def test_failed_run_cancels_pending_step_runs(pipeline_mocks):
+    step_service = pipeline_mocks["step_service"]
+    step_service.get_pipeline_steps.return_value = SimpleNamespace(data=[])
+
+    assert worker.run_pipeline_task(PIPELINE_ID, RUN_ID) is False
+
+    run_update = pipeline_mocks["update_pipeline_run_status"].await_args.kwargs[
+        "run_update"
+    ]
+    assert run_update.status == PipelineRunStatus.FAILED
+    step_service.cancel_pending_step_runs.assert_awaited_once_with(RUN_ID)
+
+
+def test_step_is_cancelled_at_time_limit(pipeline_mocks):
+    async def hang(step_type, config, input_data=None):
+        await asyncio.sleep(60)
+
+    pipeline_mocks["execute_step_by_type"].side_effect = hang
+
+    conf = worker.celery_app.conf
+    time_limit, conf.task_time_limit = conf.task_time_limit, 0.05
+    try:
+        with pytest.raises(TimeoutError):
+            worker.run_pipeline_step_task(
+                pipeline_id=PIPELINE_ID,
+                step_id="a",
+                pipeline_run_id=RUN_ID,
+                step=make_step("a"),
+            )
+    finally:
+        conf.task_time_limit = time_limit
+
+    write = pipeline_mocks["status_writer"].write.await_args
+    assert write.args[:2] == ("pipeline_step_runs", "step-run-a")
+    assert write.args[2]["status"] == StepStatus.FAILED
+    assert write.args[2]["error_message"] == "Step execution timed out"
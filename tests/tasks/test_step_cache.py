@@ -0,0 +1,95 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.schemas.pipeline_step import PipelineStepType
+from app.tasks import worker
+
+TEXT_EXTRACTOR = PipelineStepType.TEXT_EXTRACTOR.value
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+
+
+@pytest.fixture
+def redis_client():
+    client = FakeRedis()
+    with patch.object(worker, "get_redis", AsyncMock(return_value=client)):
+        yield client
+
+
+def test_step_cache_key_is_stable():
+    key = worker.step_cache_key(
+        TEXT_EXTRACTOR, {"a": 1, "b": {"x": 1, "y": 2}}, {"file_id": "f1"}
+    )
+
+    assert key.startswith("step-cache:")
+    assert key == worker.step_cache_key(
+        TEXT_EXTRACTOR, {"b": {"y": 2, "x": 1}, "a": 1}, {"file_id": "f1"}
+    )
+    assert key != worker.step_cache_key(
+        TEXT_EXTRACTOR, {"a": 1, "b": {"x": 1, "y": 2}}, {"file_id": "f2"}
+    )
+    assert key != worker.step_cache_key(
+        PipelineStepType.FIBO_MAPPER.value,
+        {"a": 1, "b": {"x": 1, "y": 2}},
+        {"file_id": "f1"},
+    )
+    assert worker.step_cache_key(TEXT_EXTRACTOR, {}, None) == worker.step_cache_key(
+        TEXT_EXTRACTOR, {}, {}
+    )
+
+
+def test_causal_cache_miss_then_hit(redis_client):
+    step = AsyncMock(return_value={"text_chunks": ["a", "b"]})
+    cached_step = worker.causal_cache(step)
+
+    first = asyncio.run(cached_step(TEXT_EXTRACTOR, {"chunk_size": 10}, {"x": 1}))
+    second = asyncio.run(cached_step(TEXT_EXTRACTOR, {"chunk_size": 10}, {"x": 1}))
+
+    assert first == second == {"text_chunks": ["a", "b"]}
+    step.assert_awaited_once()
+    assert len(redis_client.values) == 1
+
+
+def test_causal_cache_misses_on_other_inputs(redis_client):
+    step = AsyncMock(return_value={"text_chunks": []})
+    cached_step = worker.causal_cache(step)
+
+    asyncio.run(cached_step(TEXT_EXTRACTOR, {"chunk_size": 10}, {"x": 1}))
+    asyncio.run(cached_step(TEXT_EXTRACTOR, {"chunk_size": 10}, {"x": 2}))
+
+    assert step.await_count == 2
+    assert len(redis_client.values) == 2
+
+
+def test_causal_cache_skips_uncacheable_steps(redis_client):
+    step = AsyncMock(return_value={"mapped_entities": []})
+    cached_step = worker.causal_cache(step)
+
+    for _ in range(2):
+        asyncio.run(cached_step(PipelineStepType.FIBO_MAPPER.value, {}, {}))
+
+    assert step.await_count == 2
+    assert not redis_client.values
+
+
+def test_causal_cache_disabled_without_ttl(redis_client):
+    step = AsyncMock(return_value={"text_chunks": []})
+    cached_step = worker.causal_cache(step)
+
+    with patch.object(worker.settings, "PIPELINE_STEP_CACHE_TTL", 0):
+        for _ in range(2):
+            asyncio.run(cached_step(TEXT_EXTRACTOR, {}, {}))
+
+    assert step.await_count == 2
+    assert not redis_client.values
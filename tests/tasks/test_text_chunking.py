@@ -0,0 +1,46 @@
+import pytest
+
+from app.tasks.worker import iter_chunks
+
+
+def test_empty_text_has_no_chunks():
+    assert list(iter_chunks("")) == []
+    assert list(iter_chunks("  \n ")) == []
+
+
+def test_short_text_is_a_single_chunk():
+    assert list(iter_chunks("Short text.", chunk_size=100, overlap=10)) == [
+        "Short text."
+    ]
+
+
+def test_chunks_overlap():
+    text = "abcdefghijklmnopqrstuvwxy"
+
+    chunks = list(iter_chunks(text, chunk_size=10, overlap=3))
+
+    assert chunks == ["abcdefghij", "hijklmnopq", "opqrstuvwx", "vwxy"]
+    for previous, current in zip(chunks, chunks[1:]):
+        assert previous[-3:] == current[:3]
+
+
+def test_chunks_break_at_sentence_ends():
+    text = "One two. Three four. Five six. Seven eight."
+
+    chunks = list(iter_chunks(text, chunk_size=12, overlap=2))
+
+    assert chunks == ["One two.", "o. Three four.", "r. Five six.", "x. Seven eight."]
+
+
+def test_small_chunks_always_move_forward():
+    text = "a. b. c. d. e. f. g. h."
+
+    chunks = list(iter_chunks(text, chunk_size=8, overlap=2))
+
+    assert chunks == ["a. b.", "b. c.", "c. d.", "d. e.", "e. f.", "f. g. h."]
+
+
+@pytest.mark.parametrize("overlap", [10, 20])
+def test_overlap_must_be_smaller_than_chunk_size(overlap):
+    with pytest.raises(ValueError, match="must be smaller than chunk size"):
+        list(iter_chunks("Some text.", chunk_size=10, overlap=overlap))
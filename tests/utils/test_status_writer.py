@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from app.utils.status_writer import StatusWriter
+
+
+def updates(supabase):
+    return [
+        (query.table, query.args("eq")[1], query.args("update")[0])
+        for query in supabase.queries
+    ]
+
+
+def fail_rows(*row_ids):
+    def response(query):
+        row_id = query.args("eq")[1]
+        if row_id in row_ids:
+            raise RuntimeError(f"write of {row_id} failed")
+        return []
+
+    return response
+
+
+def test_patches_are_merged_per_row(supabase):
+    writer = StatusWriter(flush_interval=60)
+
+    async def run():
+        await writer.put("pipeline_runs", "r1", {"status": "running"})
+        await writer.put("pipeline_step_runs", "r1", {"status": "running"})
+        await writer.put("pipeline_runs", "r1", {"celery_task_id": "t1"})
+        await writer.put("pipeline_runs", "r1", {"status": "completed"})
+        assert not supabase.queries
+        await writer.flush()
+
+    asyncio.run(run())
+
+    assert sorted(updates(supabase)) == [
+        ("pipeline_runs", "r1", {"status": "completed", "celery_task_id": "t1"}),
+        ("pipeline_step_runs", "r1", {"status": "running"}),
+    ]
+
+
+def test_full_batch_is_flushed_immediately(supabase):
+    writer = StatusWriter(flush_interval=60, max_batch=2)
+
+    async def run():
+        await writer.put("pipeline_step_runs", "s1", {"status": "running"})
+        assert not supabase.queries
+        await writer.put("pipeline_step_runs", "s2", {"status": "running"})
+
+    asyncio.run(run())
+
+    assert sorted(row_id for _, row_id, _ in updates(supabase)) == ["s1", "s2"]
+
+
+def test_queued_patches_are_flushed_later(supabase):
+    writer = StatusWriter(flush_interval=0.01)
+
+    async def run():
+        await writer.put("pipeline_step_runs", "s1", {"status": "running"})
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    assert updates(supabase) == [("pipeline_step_runs", "s1", {"status": "running"})]
+
+
+def test_write_raises_and_requeues_failed_patches(supabase):
+    writer = StatusWriter(flush_interval=60)
+    supabase.response = fail_rows("s1")
+
+    async def run():
+        await writer.put("pipeline_step_runs", "s1", {"celery_task_id": "t1"})
+        with pytest.raises(RuntimeError, match="write of s1 failed"):
+            await writer.write("pipeline_step_runs", "s2", {"status": "running"})
+
+        supabase.response = fail_rows()
+        await writer.write("pipeline_step_runs", "s1", {"status": "completed"})
+
+    asyncio.run(run())
+
+    assert updates(supabase) == [
+        ("pipeline_step_runs", "s2", {"status": "running"}),
+        ("pipeline_step_runs", "s1", {"celery_task_id": "t1", "status": "completed"}),
+    ]
+
+
+def test_failed_patches_are_dropped_after_max_attempts(supabase):
+    writer = StatusWriter(flush_interval=60, max_attempts=2)
+    supabase.response = fail_rows("s1")
+
+    async def run():
+        await writer.put("pipeline_step_runs", "s1", {"status": "running"})
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await writer.flush()
+        await writer.flush()
+
+    asyncio.run(run())
+
+    assert not supabase.queries